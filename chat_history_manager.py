@@ -1,11 +1,30 @@
+from functools import lru_cache
 from pymongo import MongoClient
+from pymongo.write_concern import WriteConcern
 from datetime import datetime, timedelta, timezone
 
+
+@lru_cache(maxsize=None)
+def get_mongo_client(uri="mongodb://localhost:27017/"):
+    """Return the process-wide MongoClient for a URI.
+
+    MongoClient is thread-safe and pools its own connections, so every manager
+    shares one client instead of repeating the connection handshake.
+    """
+    return MongoClient(uri)
+
+
 class ChatHistoryManager:
     def __init__(self, uri="mongodb://localhost:27017/", db_name="Nquiry", collection_name="Users"):
-        self.client = MongoClient(uri)
+        self.client = get_mongo_client(uri)
         self.db = self.client[db_name]
         self.collection = self.db[collection_name]
+        # Unacknowledged (w=0) handle for log-only writes that nothing reads back.
+        # It skips the server acknowledgement round-trip, but gives no read-your-writes
+        # guarantee and drops server errors (e.g. a document over 16 MB) silently, so
+        # chat turns - re-read right after writing to build the response history - use
+        # the acknowledged self.collection, as do clears and deletes.
+        self.log_collection = self.collection.with_options(write_concern=WriteConcern(w=0))
 
     def get_ist_time(self):
         """Get current time in IST (Indian Standard Time)"""
@@ -16,8 +35,12 @@ class ChatHistoryManager:
         # Return as naive datetime (without timezone info) so frontend treats it correctly
         return ist_time
 
-    def add_message(self, user_id, role, message, session_id=None, images=None):
-        """Add a message to the user's chat history."""
+    def add_message(self, user_id, role, message, session_id=None, images=None, acknowledged=True):
+        """Add a message to the user's chat history.
+
+        acknowledged=False writes fire-and-forget (w=0) - only for messages that are
+        not read back right away and can tolerate a rare silent loss.
+        """
         message_data = {
             "role": role,
             "message": message,
@@ -51,7 +74,8 @@ class ChatHistoryManager:
             message_data["images"] = image_data
             print(f"💾 Saving message with {len(image_data)} images")
             
-        self.collection.update_one(
+        collection = self.collection if acknowledged else self.log_collection
+        collection.update_one(
             {"user_id": user_id},
             {"$push": {"messages": message_data}},
             upsert=True
@@ -62,6 +86,14 @@ class ChatHistoryManager:
         doc = self.collection.find_one({"user_id": user_id})
         return doc["messages"] if doc and "messages" in doc else []
 
+    def get_recent_history(self, user_id, limit=10):
+        """Retrieve only the last `limit` messages, trimmed server-side with $slice."""
+        doc = self.collection.find_one(
+            {"user_id": user_id},
+            {"messages": {"$slice": -limit}}
+        )
+        return doc["messages"] if doc and "messages" in doc else []
+
     def clear_history(self, user_id):
         """Clear chat history for a user."""
         self.collection.update_one(
@@ -4,6 +4,13 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Debug output - verbose request-path diagnostics are skipped unless enabled
+DEBUG_LOGGING = os.getenv("NQUIRY_DEBUG", "").lower() in ("1", "true", "yes")
+
+# Cosmetic pause (seconds) between streamed status updates - off by default so
+# status messages never add idle time in front of the real work
+STATUS_UPDATE_DELAY = float(os.getenv("NQUIRY_STATUS_DELAY", "0"))
+
 # AWS Bedrock Configuration
 AWS_REGION = "us-east-1"
 BEDROCK_MODEL = "anthropic.claude-3-5-sonnet-20240620-v1:0"  # Standard Claude 3.5 Sonnet with vision capabilities
@@ -7,11 +7,12 @@ import os
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timedelta
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import defaultdict, Counter
+from bisect import bisect_right
 import numpy as np
-from pymongo import MongoClient
-from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
+from chat_history_manager import get_mongo_client
+from semantic_search import get_sentence_model
 
 @dataclass
 class LearningMetrics:
@@ -38,7 +39,7 @@ class FeedbackAnalyzer:
     """Analyzes feedback patterns to identify improvement opportunities"""
     
     def __init__(self):
-        self.sentiment_model = SentenceTransformer('all-mpnet-base-v2')
+        self.sentiment_model = get_sentence_model('all-mpnet-base-v2')
     
     def analyze_feedback_quality(self, feedback_data: List[Dict]) -> Dict:
         """Analyze feedback to determine response quality patterns"""
@@ -205,7 +206,7 @@ class ContinuousLearningManager:
     """Main continuous learning engine"""
     
     def __init__(self, mongodb_uri="mongodb://localhost:27017/", db_name="Nquiry"):
-        self.client = MongoClient(mongodb_uri)
+        self.client = get_mongo_client(mongodb_uri)
         self.db = self.client[db_name]
         self.feedback_collection = self.db.feedback_analytics
         self.learning_collection = self.db.learning_metrics
@@ -223,15 +224,8 @@ class ContinuousLearningManager:
                       feedback_category: str, session_id: str = None) -> Dict:
         """Store feedback and trigger learning analysis"""
         
-        feedback_data = {
-            'user_id': user_id,
-            'response_content': response_content[:500],  # Truncate for storage
-            'feedback_type': feedback_type,
-            'feedback_category': feedback_category,
-            'timestamp': datetime.now().isoformat(),
-            'session_id': session_id,
-            'processed': False  # Flag for batch processing
-        }
+        feedback_data = self._build_feedback_document(user_id, response_content, feedback_type,
+                                                      feedback_category, session_id)
         
         # Store in database
         result = self.feedback_collection.insert_one(feedback_data)
@@ -246,6 +240,47 @@ class ContinuousLearningManager:
             "learning_triggered": True
         }
     
+    def store_feedback_bulk(self, items: List[Dict]) -> List[Dict]:
+        """Store several feedback items in one round-trip and trigger learning analysis once
+        
+        Each item takes the same keys as store_feedback's arguments
+        (user_id, response_content, feedback_type, feedback_category, session_id).
+        """
+        if not items:
+            return []
+        
+        documents = [
+            self._build_feedback_document(item['user_id'], item['response_content'], item['feedback_type'],
+                                          item['feedback_category'], item.get('session_id'))
+            for item in items
+        ]
+        
+        # Single insert_many instead of one insert_one per item
+        result = self.feedback_collection.insert_many(documents, ordered=False)
+        
+        # Trigger real-time learning update once for the whole batch
+        self._update_learning_metrics()
+        
+        print(f"📊 {len(documents)} feedback items stored and learning updated")
+        
+        return [
+            {"feedback_id": str(inserted_id), "learning_triggered": True}
+            for inserted_id in result.inserted_ids
+        ]
+    
+    def _build_feedback_document(self, user_id: str, response_content: str, feedback_type: str,
+                                 feedback_category: str, session_id: str = None) -> Dict:
+        """Build the feedback document stored in feedback_analytics"""
+        return {
+            'user_id': user_id,
+            'response_content': response_content[:500],  # Truncate for storage
+            'feedback_type': feedback_type,
+            'feedback_category': feedback_category,
+            'timestamp': datetime.now().isoformat(),
+            'session_id': session_id,
+            'processed': False  # Flag for batch processing
+        }
+    
     def get_learning_status(self, user_id: str = None) -> Dict:
         """Get real learning analytics (not mock data!)"""
         
@@ -279,6 +314,45 @@ class ContinuousLearningManager:
             "recommendations": analysis.get("recommendations", [])
         }
     
+    def get_learning_status_series(self, checkpoints: List[datetime], user_id: str = None) -> List[Dict]:
+        """Get learning metric snapshots as of several points in time with a single query
+        
+        Feedback up to the latest checkpoint is fetched once, sorted by timestamp, and
+        each snapshot is computed from the prefix recorded at or before its checkpoint.
+        Pattern analysis is skipped; use get_learning_status for the full report.
+        """
+        if not checkpoints:
+            return []
+        
+        query = {"timestamp": {"$lte": max(checkpoints).isoformat()}}
+        if user_id:
+            query["user_id"] = user_id
+        feedback_data = list(self.feedback_collection.find(query).sort("timestamp", 1))
+        timestamps = [fb.get('timestamp', '') for fb in feedback_data]
+        
+        snapshots = []
+        for checkpoint in checkpoints:
+            # ISO timestamps sort lexicographically, so bisect finds the prefix end
+            visible = feedback_data[:bisect_right(timestamps, checkpoint.isoformat())]
+            if not visible:
+                snapshot = self._get_initial_learning_status()
+            else:
+                metrics = self._calculate_learning_metrics(visible)
+                snapshot = {
+                    "status": self._determine_learning_status(metrics),
+                    "score": metrics.learning_score,
+                    "total_feedback": metrics.total_feedback,
+                    "positive_feedback": metrics.positive_feedback,
+                    "excellent_feedback": metrics.excellent_feedback,
+                    "recent_improvement": metrics.recent_improvement,
+                    "improvement_trend": metrics.improvement_trend,
+                    "confidence_level": metrics.confidence_level
+                }
+            snapshot["as_of"] = checkpoint.isoformat()
+            snapshots.append(snapshot)
+        
+        return snapshots
+    
     def get_adaptive_search_parameters(self) -> Dict:
         """Get dynamically adjusted search parameters based on learning"""
         
@@ -307,17 +381,12 @@ class ContinuousLearningManager:
         metrics = LearningMetrics()
         metrics.total_feedback = len(feedback_data)
         
-        # Count feedback types
-        for fb in feedback_data:
-            fb_type = fb.get('feedback_type', '')
-            if fb_type == 'positive':
-                metrics.positive_feedback += 1
-            elif fb_type == 'negative':
-                metrics.negative_feedback += 1
-            elif fb_type == 'excellent':
-                metrics.excellent_feedback += 1
-            elif fb_type == 'needs_improvement':
-                metrics.needs_improvement += 1
+        # Count feedback types in a single C-level pass
+        type_counts = Counter(fb.get('feedback_type', '') for fb in feedback_data)
+        metrics.positive_feedback = type_counts['positive']
+        metrics.negative_feedback = type_counts['negative']
+        metrics.excellent_feedback = type_counts['excellent']
+        metrics.needs_improvement = type_counts['needs_improvement']
         
         # Calculate learning score
         positive_weight = metrics.positive_feedback * 1.0
@@ -12,14 +12,28 @@ import json
 import os
 import time
 import random
-import boto3
+import traceback
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
 
 # Import your existing intelligent system
-from main import IntelligentQueryProcessor
+# (IntelligentQueryProcessor, ImageAnalyzer and boto3 are imported where they are
+# first needed so that server startup does not pay for loading them)
 from chat_history_manager import ChatHistoryManager
 from continuous_learning_manager import get_learning_manager
 from organization_access_controller import check_organization_access
-from image_analyzer import ImageAnalyzer
+from config import DEBUG_LOGGING, STATUS_UPDATE_DELAY
+
+# Use orjson for Bedrock request/response payloads when available (stdlib json fallback)
+try:
+    import orjson
+    bedrock_dumps = orjson.dumps
+    bedrock_loads = orjson.loads
+except ImportError:
+    bedrock_dumps = json.dumps
+    bedrock_loads = json.loads
 
 app = FastAPI(title="nQuiry API", version="1.0.0")
 
@@ -33,6 +47,12 @@ def get_ist_time():
     # Return as naive datetime (without timezone info) so frontend treats it correctly
     return ist_time
 
+@lru_cache(maxsize=1)
+def get_bedrock_client():
+    """Get the shared Bedrock runtime client (boto3 clients are thread-safe)"""
+    import boto3
+    return boto3.client(service_name='bedrock-runtime', region_name='us-east-1')
+
 def generate_jira_ticket_id(category: str) -> str:
     """Generate a Jira-style ticket ID"""
     random_number = random.randint(10000, 99999)
@@ -56,32 +76,25 @@ def generate_ticket_summary(description: str) -> str:
 def enhance_description_with_context(query: str, chat_history=None) -> str:
     """Enhance description with AI analysis and conversation context using AWS Bedrock"""
     try:
-        # Import AWS Bedrock client
-        import boto3
-        import json
-        
-        # Initialize Bedrock client
-        bedrock_runtime = boto3.client(
-            service_name='bedrock-runtime',
-            region_name='us-east-1'  # You can change this to your preferred region
-        )
+        # Reuse the shared Bedrock client
+        bedrock_runtime = get_bedrock_client()
         
         # Prepare conversation context
         conversation_context = ""
         if chat_history:
-            # Get recent relevant messages from user
-            user_messages = []
-            assistant_messages = []
-            for msg in chat_history[-10:]:  # Last 10 messages for context
-                if msg.get('role') == 'user' and len(msg.get('message', '')) > 5:
-                    user_messages.append(msg.get('message', ''))
-                elif msg.get('role') == 'assistant' and len(msg.get('message', '')) > 10:
-                    assistant_messages.append(msg.get('message', ''))
+            # Walk the last 10 messages newest-first, keeping up to 5 relevant user messages
+            recent_messages = islice(reversed(chat_history), 10)
+            user_messages = list(islice(
+                (msg.get('message', '') for msg in recent_messages
+                 if msg.get('role') == 'user' and len(msg.get('message', '')) > 5),
+                5
+            ))
+            user_messages.reverse()  # Restore chronological order
             
             if user_messages:
-                conversation_context = f"\n\nConversation History:\n"
-                for i, msg in enumerate(user_messages[-5:], 1):  # Last 5 user messages
-                    conversation_context += f"User Message {i}: {msg}\n"
+                parts = ["\n\nConversation History:"]
+                parts.extend(f"User Message {i}: {msg}" for i, msg in enumerate(user_messages, 1))
+                conversation_context = "\n".join(parts) + "\n"
         
         # Create prompt for Bedrock
         prompt = f"""You are a technical support analyst. Analyze the following user query and conversation history to create a comprehensive ticket description.
@@ -112,11 +125,11 @@ Provide only the enhanced description without any prefixes or labels. Make it 2-
         
         response = bedrock_runtime.invoke_model(
             modelId="anthropic.claude-3-sonnet-20240229-v1:0",  # Using Claude 3 Sonnet
-            body=json.dumps(body)
+            body=bedrock_dumps(body)
         )
         
         # Parse response
-        response_body = json.loads(response['body'].read())
+        response_body = bedrock_loads(response['body'].read())
         enhanced_description = response_body['content'][0]['text'].strip()
         
         print(f"🤖 Generated enhanced description via Bedrock: {enhanced_description[:100]}...")
@@ -132,7 +145,7 @@ Provide only the enhanced description without any prefixes or labels. Make it 2-
         # Add conversation context manually if available
         if chat_history:
             user_messages = []
-            for msg in chat_history[-5:]:
+            for msg in islice(reversed(chat_history), 5):
                 if msg.get('role') == 'user' and len(msg.get('message', '')) > 10:
                     user_messages.append(msg.get('message', ''))
             
@@ -218,43 +231,108 @@ except Exception as e:
 
 # Global dictionaries for storing user processors and chat histories
 processors = {}  # Store processor instances per user
-chat_histories = {}  # Fallback in-memory chat storage
+chat_histories = {}  # Fallback in-memory chat storage (bounded per user)
 pending_tickets = {}  # Store partial ticket data for follow-up questions
 
 
+FALLBACK_HISTORY_LIMIT = 200  # Max messages kept per user in fallback storage
+
+
+def new_fallback_history(messages=()):
+    """Create a bounded in-memory history; the oldest messages drop off automatically"""
+    return deque(messages, maxlen=FALLBACK_HISTORY_LIMIT)
+
+
+async def pace_status_update():
+    """Optional pause so a streamed status stays visible (see STATUS_UPDATE_DELAY)"""
+    if STATUS_UPDATE_DELAY > 0:
+        await asyncio.sleep(STATUS_UPDATE_DELAY)
+
+
+# Ticket download/simulation content: header fields already printed above the field listings
+TICKET_HEADER_FIELDS = frozenset({
+    'ticket_id', 'jira_ticket_id', 'category', 'customer', 'customer_email', 'original_query', 'created_date'
+})
+# Fields listed first in auto-created ticket files, in this order
+AUTO_TICKET_PRIORITY_FIELDS = ('description', 'summary', 'priority', 'area', 'affected_version', 'reported_environment', 'environment')
+# Form ticket fields shown in the fixed TICKET DETAILS block
+FORM_TICKET_DETAIL_FIELDS = frozenset({
+    'priority', 'area_affected', 'version_affected', 'environment', 'description', 'is_escalation'
+})
+
+# Message classification phrase tables - built once at import, not on every message
+
+# Expanded list of greeting patterns
+SIMPLE_GREETINGS = frozenset({
+    'hi', 'hello', 'hey', 'hiya', 'howdy', 'greetings', 
+    'good morning', 'good afternoon', 'good evening', 'good day',
+    'hey there', 'hi there', 'hello there', 'morning', 'afternoon', 'evening',
+    'sup', 'what\'s up', 'whats up', 'yo', 'helo', 'hllo'
+})
+
+# Also check for greeting-like patterns
+GREETING_PATTERNS = (
+    'hi nquiry', 'hello nquiry', 'hey nquiry',
+    'hi there', 'hello everyone', 'good to see you'
+)
+
+GREETING_STARTERS = ('hi', 'hello', 'hey', 'good morning', 'good afternoon', 'good evening')
+
+# Common satisfaction/completion phrases
+SATISFACTION_PHRASES = frozenset({
+    'no', 'nope', 'no thanks', 'no thank you', 'that\'s it', 'thats it',
+    'i\'m good', 'im good', 'all good', 'that\'s all', 'thats all',
+    'nothing else', 'no more help', 'i\'m satisfied', 'im satisfied',
+    'that helps', 'that\'s helpful', 'thats helpful', 'perfect',
+    'thank you', 'thanks', 'appreciate it', 'that works',
+    'no further assistance', 'no additional help', 'that\'s enough',
+    'thats enough', 'all set', 'we\'re good', 'were good'
+})
+
+# Satisfaction indicators inside longer responses
+SATISFACTION_INDICATORS = ('no thanks', 'no thank you', 'that\'s all', 'nothing else', 'i\'m good', 'all good')
+
+# Direct ticket creation keywords - make them more specific to avoid false positives
+TICKET_REQUEST_KEYWORDS = (
+    'create a ticket', 'create ticket', 'make a ticket', 'make ticket',
+    'open a ticket', 'open ticket', 'submit a ticket', 'submit ticket',
+    'file a ticket', 'file ticket', 'raise a ticket', 'raise ticket',
+    'log a ticket', 'log ticket', 'create support ticket', 'ticket for'
+)
+
+# Human support escalation keywords (natural language patterns)
+ESCALATION_KEYWORDS = (
+    'assign it to human support', 'assign to human support', 'escalate to support',
+    'escalate to human support', 'escalate to support team', 'need human assistance',
+    'need human help', 'transfer to human', 'human support', 'speak to a human',
+    'talk to a human', 'contact human support', 'get human help',
+    'assign to support team', 'escalate this issue', 'escalate this to support',
+    'forward to support', 'send to support team', 'human intervention needed',
+    'need manual assistance', 'require human support', 'human review needed',
+    'assign for further investigation', 'human support for further investigation'
+)
+
+DIRECT_TICKET_KEYWORDS = TICKET_REQUEST_KEYWORDS + ESCALATION_KEYWORDS
+
+
 def is_greeting_message(message: str) -> tuple:
     """Detect if message is a greeting using pattern matching (no LLM needed)"""
     message_lower = message.lower().strip()
     
-    # Expanded list of greeting patterns
-    simple_greetings = [
-        'hi', 'hello', 'hey', 'hiya', 'howdy', 'greetings', 
-        'good morning', 'good afternoon', 'good evening', 'good day',
-        'hey there', 'hi there', 'hello there', 'morning', 'afternoon', 'evening',
-        'sup', 'what\'s up', 'whats up', 'yo', 'helo', 'hllo'
-    ]
-    
-    # Also check for greeting-like patterns
-    greeting_patterns = [
-        'hi nquiry', 'hello nquiry', 'hey nquiry',
-        'hi there', 'hello everyone', 'good to see you'
-    ]
-    
     # Check if message is exactly a simple greeting (or with punctuation)
     clean_message = message_lower.rstrip('!.,?').strip()
     
     # Check exact matches
-    if clean_message in simple_greetings:
+    if clean_message in SIMPLE_GREETINGS:
         return True, get_greeting_response()
     
     # Check pattern matches
-    for pattern in greeting_patterns:
+    for pattern in GREETING_PATTERNS:
         if pattern in clean_message:
             return True, get_greeting_response()
     
     # Check if message starts with greeting words
-    greeting_starters = ['hi', 'hello', 'hey', 'good morning', 'good afternoon', 'good evening']
-    for starter in greeting_starters:
+    for starter in GREETING_STARTERS:
         if clean_message.startswith(starter) and len(clean_message) <= len(starter) + 10:
             return True, get_greeting_response()
     
@@ -278,22 +356,11 @@ def is_satisfaction_response(message: str) -> tuple:
     """Detect if user is indicating they're satisfied or don't need more help"""
     message_lower = message.lower().strip()
     
-    # Common satisfaction/completion phrases
-    satisfaction_phrases = [
-        'no', 'nope', 'no thanks', 'no thank you', 'that\'s it', 'thats it',
-        'i\'m good', 'im good', 'all good', 'that\'s all', 'thats all',
-        'nothing else', 'no more help', 'i\'m satisfied', 'im satisfied',
-        'that helps', 'that\'s helpful', 'thats helpful', 'perfect',
-        'thank you', 'thanks', 'appreciate it', 'that works',
-        'no further assistance', 'no additional help', 'that\'s enough',
-        'thats enough', 'all set', 'we\'re good', 'were good'
-    ]
-    
     # Check for exact matches or close matches
     clean_message = message_lower.rstrip('!.,?').strip()
     
     # Direct satisfaction indicators
-    if clean_message in satisfaction_phrases:
+    if clean_message in SATISFACTION_PHRASES:
         closing_response = """Thank you for using Nquiry! 🙏 
 
 I'm glad I could assist you today. If you need any help in the future, please don't hesitate to reach out. 
@@ -302,7 +369,7 @@ Have a great day! 👋"""
         return True, closing_response
     
     # Check for longer responses that contain satisfaction indicators
-    if any(phrase in clean_message for phrase in ['no thanks', 'no thank you', 'that\'s all', 'nothing else', 'i\'m good', 'all good']):
+    if any(phrase in clean_message for phrase in SATISFACTION_INDICATORS):
         closing_response = """Thank you for using nQuiry! 🙏 
 
 I'm glad I could help resolve your query. If you have any other questions or need assistance in the future, feel free to ask anytime.
@@ -317,29 +384,8 @@ def is_direct_ticket_request(query):
     """Check if the user is directly requesting to create a ticket or escalate to human support"""
     query_lower = query.lower().strip()
     
-    # Direct ticket creation keywords - make them more specific to avoid false positives
-    ticket_keywords = [
-        'create a ticket', 'create ticket', 'make a ticket', 'make ticket',
-        'open a ticket', 'open ticket', 'submit a ticket', 'submit ticket',
-        'file a ticket', 'file ticket', 'raise a ticket', 'raise ticket',
-        'log a ticket', 'log ticket', 'create support ticket', 'ticket for'
-    ]
-    
-    # Human support escalation keywords (natural language patterns)
-    escalation_keywords = [
-        'assign it to human support', 'assign to human support', 'escalate to support',
-        'escalate to human support', 'escalate to support team', 'need human assistance',
-        'need human help', 'transfer to human', 'human support', 'speak to a human',
-        'talk to a human', 'contact human support', 'get human help',
-        'assign to support team', 'escalate this issue', 'escalate this to support',
-        'forward to support', 'send to support team', 'human intervention needed',
-        'need manual assistance', 'require human support', 'human review needed',
-        'assign for further investigation', 'human support for further investigation'
-    ]
-    
     # Check for any matching keywords - but require they be somewhat prominent in the query
-    all_keywords = ticket_keywords + escalation_keywords
-    matches = [keyword for keyword in all_keywords if keyword in query_lower]
+    matches = [keyword for keyword in DIRECT_TICKET_KEYWORDS if keyword in query_lower]
     
     # Only consider it a direct request if:
     # 1. The keyword match is substantial relative to query length, OR
@@ -431,15 +477,8 @@ def analyze_support_request_with_ai(query: str, ai_response: str = None, convers
     Use AI to analyze a support request and generate an enhanced description for Zendesk ticket
     """
     try:
-        import boto3
-        import json
-        from datetime import datetime
-        
-        # Initialize Bedrock client
-        bedrock_runtime = boto3.client(
-            service_name='bedrock-runtime',
-            region_name='us-east-1'
-        )
+        # Reuse the shared Bedrock client
+        bedrock_runtime = get_bedrock_client()
         
         # Prepare conversation context
         conversation_summary = ""
@@ -479,7 +518,7 @@ Format it as a professional support ticket description that will help the suppor
 Provide only the enhanced description in a format suitable for a support ticket."""
 
         # Call Bedrock
-        body = json.dumps({
+        body = bedrock_dumps({
             "anthropic_version": "bedrock-2023-05-31",
             "max_tokens": 1000,
             "messages": [
@@ -496,7 +535,7 @@ Provide only the enhanced description in a format suitable for a support ticket.
             modelId="anthropic.claude-3-5-sonnet-20240620-v1:0"
         )
         
-        response_body = json.loads(response['body'].read())
+        response_body = bedrock_loads(response['body'].read())
         enhanced_description = response_body['content'][0]['text'].strip()
         
         # Add header and footer
@@ -554,7 +593,8 @@ def create_zendesk_ticket_intelligent(query: str, customer_email: str, ai_respon
         
         # Create ticket in Zendesk
         result = zendesk_tool.create_ticket(ticket_data)
-        print(f"🔍 DEBUG: Zendesk result = {result}")
+        if DEBUG_LOGGING:
+            print(f"🔍 DEBUG: Zendesk result = {result}")
         
         if result.get('status') == 'success':
             # Zendesk tool returns status='success' with direct fields
@@ -608,21 +648,13 @@ Our support team will review your request and respond soon. You can track progre
 def create_jira_ticket_simulated(query: str, customer_email: str) -> Dict:
     """Create a simulated JIRA ticket for regular domains (existing functionality)"""
     try:
-        from ticket_creator import TicketCreator
+        from ticket_creator import TicketCreator, customer_name_for_domain
         
         ticket_creator = TicketCreator()
         
         # Extract customer info
         customer_domain = customer_email.split('@')[-1] if customer_email else 'unknown.com'
-        domain_to_customer = {
-            'amd.com': 'AMD',
-            'novartis.com': 'Novartis',
-            'wdc.com': 'Wdc',
-            'abbott.com': 'Abbott',
-            'abbvie.com': 'Abbvie',
-            'amgen.com': 'Amgen'
-        }
-        customer = domain_to_customer.get(customer_domain, customer_domain.split('.')[0].capitalize())
+        customer = customer_name_for_domain(customer_domain)
         
         # Determine category using existing logic
         category = ticket_creator.determine_ticket_category(query, customer, customer_email)
@@ -679,7 +711,9 @@ def create_jira_ticket_simulated(query: str, customer_email: str) -> Dict:
         print(f"🎯 Analysis results: Category={category}, Priority={priority}, Area={area}, Environment={environment_display}")
         
         # Create ticket data
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # One clock read so the ticket id and created date agree
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         ticket_id = f"TICKET_{category}_{customer}_{timestamp}"
         jira_ticket_id = generate_jira_ticket_id(category)
         
@@ -705,7 +739,7 @@ def create_jira_ticket_simulated(query: str, customer_email: str) -> Dict:
             'customer': customer,
             'customer_email': customer_email,
             'original_query': query,
-            'created_date': datetime.now().isoformat(),
+            'created_date': now.isoformat(),
             'priority': priority,
             'description': enhanced_description,
             'summary': ticket_summary
@@ -775,9 +809,8 @@ def create_jira_ticket_simulated(query: str, customer_email: str) -> Dict:
         print(f"✅ Final ticket data includes fields: {list(ticket_data.keys())}")
         
         # Save ticket to file
-        output_dir = 'ticket_simulation_output'
-        import os
-        os.makedirs(output_dir, exist_ok=True)
+        from ticket_creator import ensure_output_dir, field_label
+        output_dir = ensure_output_dir('ticket_simulation_output')
         
         filename = f"ticket_intelligent_{ticket_id.replace('TICKET_', '')}_{timestamp}.txt"
         filepath = os.path.join(output_dir, filename)
@@ -803,25 +836,25 @@ TICKET DETAILS:
 ===============
 """
         
-        # Add all ticket fields to content in a structured way
+        # Add all ticket fields to content in a structured way - collected as parts, joined once
+        parts = [ticket_content]
+        append = parts.append
         # Priority fields first (excluding creation_method)
-        priority_fields = ['description', 'summary', 'priority', 'area', 'affected_version', 'reported_environment', 'environment']
-        for field in priority_fields:
+        for field in AUTO_TICKET_PRIORITY_FIELDS:
             if field in ticket_data:
-                field_label = field.replace('_', ' ').title()
-                ticket_content += f"{field_label}: {ticket_data[field]}\n"
+                append(f"{field_label(field)}: {ticket_data[field]}\n")
         
         # Then add auto-populated fields from category config
-        ticket_content += f"\nAUTO-POPULATED FIELDS (from {category} category):\n"
-        ticket_content += "=" * 50 + "\n"
+        append(f"\nAUTO-POPULATED FIELDS (from {category} category):\n")
+        append("=" * 50 + "\n")
         
         for field, value in ticket_data.items():
-            if field not in priority_fields and field not in ['ticket_id', 'jira_ticket_id', 'category', 'customer', 'customer_email', 'original_query', 'created_date']:
-                field_label = field.replace('_', ' ').title()
-                ticket_content += f"{field_label}: {value}\n"
+            if field not in AUTO_TICKET_PRIORITY_FIELDS and field not in TICKET_HEADER_FIELDS:
+                append(f"{field_label(field)}: {value}\n")
+        ticket_content = "".join(parts)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(ticket_content)
+        # Content is complete - one text-mode write (newlines stay platform-native, CRLF on Windows)
+        Path(filepath).write_text(ticket_content, encoding='utf-8')
         
         print(f"✅ Intelligent ticket created: {ticket_id}")
         print(f"💾 Saved to: {filepath}")
@@ -851,6 +884,7 @@ def create_processor_for_user(customer_email: str):
     
     # Create a custom initialization that bypasses the email prompt
     # We'll monkey-patch the MindTouchTool.get_customer_email_from_input method temporarily
+    from main import IntelligentQueryProcessor
     from tools.mindtouch_tool import MindTouchTool
     
     # Store original method
@@ -895,7 +929,8 @@ async def initialize_processor(request: InitializeRequest):
         processors[customer_email] = {
             'customer_email': customer_email,
             'org_data': org_data,
-            'processor': None  # Will be initialized when first message is sent
+            'processor': None,  # Will be initialized when first message is sent
+            'lock': asyncio.Lock()  # One in-flight query per processor, evicted with it
         }
         
         print(f"✅ Prepared nQuiry initialization for {customer_email} ({org_data.get('organization')})")
@@ -945,7 +980,7 @@ async def send_message_stream(message: StreamingChatMessage):
             
             # Send initial status
             yield await send_status_update("🤖 Nquiry is thinking...", "initializing", "🤖")
-            await asyncio.sleep(0.1)  # Small delay for UX
+            await pace_status_update()
             
             # Check if user is initialized, if not auto-initialize
             if user_id not in processors:
@@ -974,7 +1009,8 @@ async def send_message_stream(message: StreamingChatMessage):
                 processors[user_id] = {
                     'customer_email': user_id,
                     'org_data': org_data,
-                    'processor': None  # Will be initialized below
+                    'processor': None,  # Will be initialized below
+                    'lock': asyncio.Lock()  # One in-flight query per processor, evicted with it
                 }
                 
                 print(f"✅ Auto-initialized user {user_id} ({org_data.get('organization')})")
@@ -990,8 +1026,9 @@ async def send_message_stream(message: StreamingChatMessage):
                 user_data['processor'] = processor
                 
                 # Debug: Check domain routing
-                print(f"🔍 DEBUG - User Email: {user_id}")
-                print(f"🔍 DEBUG - Processor is_support_domain: {processor.is_support_domain if hasattr(processor, 'is_support_domain') else 'NOT SET'}")
+                if DEBUG_LOGGING:
+                    print(f"🔍 DEBUG - User Email: {user_id}")
+                    print(f"🔍 DEBUG - Processor is_support_domain: {processor.is_support_domain if hasattr(processor, 'is_support_domain') else 'NOT SET'}")
             
             processor = user_data['processor']
             
@@ -1004,7 +1041,7 @@ async def send_message_stream(message: StreamingChatMessage):
             else:
                 # Fallback to in-memory storage
                 if user_id not in chat_histories:
-                    chat_histories[user_id] = []
+                    chat_histories[user_id] = new_fallback_history()
                 chat_histories[user_id].append({
                     "role": "user",
                     "message": message.message,
@@ -1065,6 +1102,7 @@ async def send_message_stream(message: StreamingChatMessage):
                 print(f"📸 Processing {len(message.images)} uploaded images...")
                 
                 try:
+                    from image_analyzer import ImageAnalyzer
                     image_analyzer = ImageAnalyzer()
                     
                     # Prepare images in the format expected by analyze_images_with_query
@@ -1138,11 +1176,11 @@ Keep the response under 300 words and actionable."""
                             
                             try:
                                 # Use AWS Bedrock for direct response
-                                bedrock_client = boto3.client('bedrock-runtime', region_name='us-east-1')
+                                bedrock_client = get_bedrock_client()
                                 
                                 response = bedrock_client.invoke_model(
                                     modelId='anthropic.claude-3-5-sonnet-20240620-v1:0',  # Use supported model ID
-                                    body=json.dumps({
+                                    body=bedrock_dumps({
                                         "anthropic_version": "bedrock-2023-05-31",
                                         "max_tokens": 500,  # Shorter response for speed
                                         "temperature": 0.1,  # More deterministic
@@ -1155,7 +1193,7 @@ Keep the response under 300 words and actionable."""
                                     })
                                 )
                                 
-                                response_body = json.loads(response['body'].read())
+                                response_body = bedrock_loads(response['body'].read())
                                 direct_response = response_body['content'][0]['text']
                                 
                                 # Add ticket creation offer based on domain type
@@ -1171,7 +1209,7 @@ Keep the response under 300 words and actionable."""
                                     chat_history_manager.add_message(user_id, "assistant", final_response, message.session_id)
                                 else:
                                     if user_id not in chat_histories:
-                                        chat_histories[user_id] = []
+                                        chat_histories[user_id] = new_fallback_history()
                                     # Convert ImageData objects for fallback storage
                                     images_data = []
                                     if message.images:
@@ -1355,7 +1393,6 @@ Keep the response under 300 words and actionable."""
                             
                     except Exception as e:
                         print(f"❌ Error in smart conversational ticket: {e}")
-                        import traceback
                         traceback.print_exc()
                         # Clean up and continue normally
                         if user_id in pending_tickets and pending_tickets[user_id].get('type') == 'smart_conversational':
@@ -1427,7 +1464,9 @@ Keep the response under 300 words and actionable."""
                                 from ticket_creator import TicketCreator
                                 ticket_creator = TicketCreator()
                                 
-                                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                                # One clock read so the ticket id and created date agree
+                                now = datetime.now()
+                                timestamp = now.strftime("%Y%m%d_%H%M%S")
                                 ticket_id = f"TICKET_{analysis['category']}_{analysis['customer']}_{timestamp}"
                                 jira_ticket_id = generate_jira_ticket_id(analysis['category'])
                                 
@@ -1435,7 +1474,7 @@ Keep the response under 300 words and actionable."""
                                 chat_history = []
                                 if chat_history_manager:
                                     try:
-                                        chat_history = chat_history_manager.get_chat_history(analysis['customer_email'])
+                                        chat_history = chat_history_manager.get_recent_history(analysis['customer_email'], 10)
                                     except:
                                         chat_history = chat_histories.get(analysis['customer_email'], [])
                                 else:
@@ -1461,7 +1500,7 @@ Keep the response under 300 words and actionable."""
                                     'description': enhanced_description,
                                     'summary': ticket_summary,
                                     'original_query': original_query,
-                                    'created_date': datetime.now().isoformat()
+                                    'created_date': now.isoformat()
                                 }
                                 
                                 # Add all populated fields with placeholder processing
@@ -1544,15 +1583,14 @@ Description: {ticket_data['description']}
 AUTO-POPULATED FIELDS FROM {ticket_data['category']} CATEGORY:
 """
                                         
-                                        for field, value in ticket_data.items():
-                                            if field not in ['ticket_id', 'jira_ticket_id', 'category', 'customer', 'customer_email', 'original_query', 'created_date', 'description']:
-                                                field_label = field.replace('_', ' ').title()
-                                                ticket_content += f"• {field_label}: {value}\n"
-                                        
+                                        ticket_content += "".join(
+                                            f"• {field.replace('_', ' ').title()}: {value}\n"
+                                            for field, value in ticket_data.items()
+                                            if field != 'description' and field not in TICKET_HEADER_FIELDS
+                                        )
                                         ticket_content += f"\nThis ticket was created automatically using AI analysis."
                                         
-                                        with open(filepath, 'w', encoding='utf-8') as f:
-                                            f.write(ticket_content)
+                                        Path(filepath).write_text(ticket_content, encoding='utf-8')
                                         
                                         print(f"💾 Ticket saved to: {filepath}")
                                     except Exception as save_error:
@@ -1863,7 +1901,7 @@ Is there anything else I can help you with today?"""
                             chat_history_manager.add_message(user_id, "assistant", auto_response, message.session_id)
                         else:
                             if user_id not in chat_histories:
-                                chat_histories[user_id] = []
+                                chat_histories[user_id] = new_fallback_history()
                             chat_histories[user_id].append({
                                 "role": "assistant", 
                                 "message": auto_response,
@@ -1888,7 +1926,7 @@ Is there anything else I can help you with today?"""
                             chat_history_manager.add_message(user_id, "assistant", acknowledgment, message.session_id)
                         else:
                             if user_id not in chat_histories:
-                                chat_histories[user_id] = []
+                                chat_histories[user_id] = new_fallback_history()
                             chat_histories[user_id].append({
                                 "role": "assistant", 
                                 "message": acknowledgment,
@@ -1904,32 +1942,33 @@ Is there anything else I can help you with today?"""
                 # Determine workflow type based on domain
                 is_support_domain = processor.is_support_domain if hasattr(processor, 'is_support_domain') else False
                 
-                print(f"🔍 DEBUG - Routing Decision: user_id={user_id}, is_support_domain={is_support_domain}")
+                if DEBUG_LOGGING:
+                    print(f"🔍 DEBUG - Routing Decision: user_id={user_id}, is_support_domain={is_support_domain}")
                 
                 if is_support_domain:
                     print(f"📚 Query '{message.message}' -> Using support flow: Zendesk → Azure Blob → Comprehensive Response")
                     
-                    # Send support workflow status updates with delays
+                    # Send support workflow status updates
                     yield await send_status_update("🎫 Looking through Zendesk tickets...", "searching-zendesk", "🎫")
-                    await asyncio.sleep(0.5)  # Brief delay to show status
+                    await pace_status_update()
                     
                     yield await send_status_update("🗂️ Searching SharePoint documents...", "searching-sharepoint", "🗂️")
-                    await asyncio.sleep(0.5)
+                    await pace_status_update()
                     
                     yield await send_status_update("📚 Searching MindTouch knowledge base...", "searching-mindtouch", "📚")
-                    await asyncio.sleep(0.5)
+                    await pace_status_update()
                 else:
                     print(f"📚 Query '{message.message}' -> Using search flow first: JIRA → MindTouch → Comprehensive Response")
                     
-                    # Send regular workflow status updates with delays
+                    # Send regular workflow status updates
                     yield await send_status_update("🎫 Looking through JIRA tickets...", "searching-jira", "🎫")
-                    await asyncio.sleep(0.5)  # Brief delay to show status
+                    await pace_status_update()
                     
                     yield await send_status_update("📚 Searching MindTouch articles...", "searching-mindtouch", "📚")
-                    await asyncio.sleep(0.5)
+                    await pace_status_update()
                     
                     yield await send_status_update("🧠 Analyzing search results...", "analyzing", "🧠")
-                    await asyncio.sleep(0.5)
+                    await pace_status_update()
                 
                 yield await send_status_update("🧠 Generating response...", "generating", "🧠")
                 
@@ -1938,6 +1977,7 @@ Is there anything else I can help you with today?"""
                 if message.images and len(message.images) > 0:
                     yield await send_status_update("🖼️ Analyzing uploaded images...", "image-analysis", "🖼️")
                     try:
+                        from image_analyzer import ImageAnalyzer
                         image_analyzer = ImageAnalyzer()
                         print(f"🖼️ Analyzing {len(message.images)} image(s)...")
                         
@@ -1994,7 +2034,10 @@ Is there anything else I can help you with today?"""
                         print("🔍 Searching for information: Zendesk → Azure Blob → Comprehensive Response")
                     else:
                         print("🔍 Searching for information: JIRA → MindTouch → Comprehensive Response")
-                    result = processor.process_query(user_id, search_message, processed_history)
+                    # Run the blocking search/LLM pipeline off the event loop so other requests keep flowing
+                    # (the per-user lock keeps two requests from sharing one processor concurrently)
+                    async with user_data['lock']:
+                        result = await asyncio.to_thread(processor.process_query, user_id, search_message, processed_history)
                     
                     if result and isinstance(result, dict):
                         # Handle process_query result
@@ -2164,7 +2207,8 @@ async def send_message(message: ChatMessage):
             processors[user_id] = {
                 'customer_email': user_id,
                 'org_data': org_data,
-                'processor': None  # Will be initialized below
+                'processor': None,  # Will be initialized below
+                'lock': asyncio.Lock()  # One in-flight query per processor, evicted with it
             }
             
             print(f"✅ Auto-initialized user {user_id} ({org_data.get('organization')})")
@@ -2188,7 +2232,7 @@ async def send_message(message: ChatMessage):
         else:
             # Fallback to in-memory storage
             if user_id not in chat_histories:
-                chat_histories[user_id] = []
+                chat_histories[user_id] = new_fallback_history()
             # Convert ImageData objects to dictionaries for storage
             images_data = []
             if message.images:
@@ -2463,7 +2507,7 @@ Is there anything else I can help you with today?"""
                         chat_history_manager.add_message(user_id, "assistant", auto_response, message.session_id)
                     else:
                         if user_id not in chat_histories:
-                            chat_histories[user_id] = []
+                            chat_histories[user_id] = new_fallback_history()
                         chat_histories[user_id].append({
                             "role": "assistant", 
                             "message": auto_response,
@@ -2487,7 +2531,7 @@ Is there anything else I can help you with today?"""
                         chat_history_manager.add_message(user_id, "assistant", acknowledgment, message.session_id)
                     else:
                         if user_id not in chat_histories:
-                            chat_histories[user_id] = []
+                            chat_histories[user_id] = new_fallback_history()
                         chat_histories[user_id].append({
                             "role": "assistant", 
                             "message": acknowledgment,
@@ -2514,6 +2558,7 @@ Is there anything else I can help you with today?"""
                 image_context = ""
                 if message.images and len(message.images) > 0:
                     try:
+                        from image_analyzer import ImageAnalyzer
                         image_analyzer = ImageAnalyzer()
                         print(f"🖼️ Analyzing {len(message.images)} image(s)...")
                         
@@ -2571,7 +2616,10 @@ Is there anything else I can help you with today?"""
                     print("🔍 Searching for information: Zendesk → Azure Blob → Comprehensive Response")
                 else:
                     print("🔍 Searching for information: JIRA → MindTouch → Comprehensive Response")
-                result = processor.process_query(user_id, search_message, processed_history)
+                # Run the blocking search/LLM pipeline off the event loop so other requests keep flowing
+                # (the per-user lock keeps two requests from sharing one processor concurrently)
+                async with user_data['lock']:
+                    result = await asyncio.to_thread(processor.process_query, user_id, search_message, processed_history)
                 
                 if result and isinstance(result, dict):
                     # Handle process_query result
@@ -2756,7 +2804,7 @@ async def clear_chat_history(user_id: str):
         else:
             # Clear from in-memory storage
             if user_id in chat_histories:
-                chat_histories[user_id] = []
+                chat_histories[user_id] = new_fallback_history()
         
         return {"message": "Chat history cleared"}
     except Exception as e:
@@ -2802,7 +2850,7 @@ async def delete_conversation(user_id: str, question: str = None):
                     new_messages.append(msg)
                     i += 1
                 
-                chat_histories[user_id] = new_messages
+                chat_histories[user_id] = new_fallback_history(new_messages)
                 if deleted:
                     return {"message": "Conversation deleted successfully"}
                 else:
@@ -2924,11 +2972,11 @@ ADDITIONAL FIELDS:
 """
         
         # Add any additional fields
-        for key, value in ticket_result.items():
-            if key not in ['ticket_id', 'jira_ticket_id', 'category', 'customer', 'customer_email', 
-                          'created_date', 'original_query', 'priority', 'area_affected', 
-                          'version_affected', 'environment', 'description', 'is_escalation']:
-                ticket_content += f"{key.replace('_', ' ').title()}: {value}\n"
+        ticket_content += "".join(
+            f"{key.replace('_', ' ').title()}: {value}\n"
+            for key, value in ticket_result.items()
+            if key not in TICKET_HEADER_FIELDS and key not in FORM_TICKET_DETAIL_FIELDS
+        )
         
         # Add follow-up message to chat history
         if chat_history_manager and customer_email:
@@ -2939,7 +2987,7 @@ ADDITIONAL FIELDS:
             
             # Also add to in-memory storage as backup
             if customer_email not in chat_histories:
-                chat_histories[customer_email] = []
+                chat_histories[customer_email] = new_fallback_history()
             chat_histories[customer_email].append({
                 "role": "assistant",
                 "message": follow_up_message,
@@ -3035,8 +3083,7 @@ USER PROVIDED ANSWERS:
 """
             
             # Add user answers
-            for key, value in request.answers.items():
-                ticket_content += f"{key.replace('_', ' ').title()}: {value}\n"
+            ticket_content += "".join(f"{key.replace('_', ' ').title()}: {value}\n" for key, value in request.answers.items())
             
             # Add AI analysis info
             if request.analysis:
@@ -3055,7 +3102,7 @@ Auto-detected Priority: {request.analysis.get('priority', 'N/A')}
                 chat_history_manager.add_message(request.customer_email, "assistant", response_message, None)
             else:
                 if request.customer_email not in chat_histories:
-                    chat_histories[request.customer_email] = []
+                    chat_histories[request.customer_email] = new_fallback_history()
                 chat_histories[request.customer_email].append({
                     "role": "assistant",
                     "message": response_message,
@@ -3133,7 +3180,7 @@ async def create_minimal_ticket(request: Dict[str, str]):
                 chat_history_manager.add_message(customer_email, "assistant", response_message, None)
             else:
                 if customer_email not in chat_histories:
-                    chat_histories[customer_email] = []
+                    chat_histories[customer_email] = new_fallback_history()
                 chat_histories[customer_email].append({
                     "role": "assistant",
                     "message": response_message,
@@ -3338,7 +3385,7 @@ async def ticket_follow_up(request: dict):
         else:
             # Fallback to in-memory storage
             if user_id not in chat_histories:
-                chat_histories[user_id] = []
+                chat_histories[user_id] = new_fallback_history()
         chat_histories[user_id].append({
             "role": "assistant",
             "message": follow_up_message,
@@ -3368,7 +3415,7 @@ async def bot_follow_up(request: dict):
         
         # Also add to in-memory as backup
         if user_id not in chat_histories:
-            chat_histories[user_id] = []
+            chat_histories[user_id] = new_fallback_history()
         chat_histories[user_id].append({
             "role": "assistant",
             "message": follow_up_message,
@@ -3402,7 +3449,7 @@ async def add_bot_message(request: dict):
         else:
             # Fallback to in-memory storage
             if user_id not in chat_histories:
-                chat_histories[user_id] = []
+                chat_histories[user_id] = new_fallback_history()
             chat_histories[user_id].append({
                 "role": "assistant",
                 "message": message,
@@ -3447,7 +3494,7 @@ async def get_latest_messages(user_id: str, since: Optional[str] = None):
 async def preview_ticket_category(request: dict):
     """Preview what ticket category would be determined for a query"""
     try:
-        from ticket_creator import TicketCreator
+        from ticket_creator import TicketCreator, customer_name_for_domain, support_summary
         
         ticket_creator = TicketCreator()
         query = request.get("query", "")
@@ -3456,15 +3503,8 @@ async def preview_ticket_category(request: dict):
         # Extract customer name from email
         customer = "UNKNOWN"
         if customer_email:
-            domain = customer_email.split('@')[-1].lower()
-            domain_to_customer = {
-                'amd.com': 'AMD',
-                'novartis.com': 'Novartis',  
-                'wdc.com': 'Wdc',
-                'abbott.com': 'Abbott',
-                'abbvie.com': 'Abbvie'
-            }
-            customer = domain_to_customer.get(domain, domain.split('.')[0].capitalize())
+            domain = customer_email.rpartition('@')[2].lower()
+            customer = customer_name_for_domain(domain)
         
         # Determine category
         category = ticket_creator.determine_ticket_category(query, customer, customer_email)
@@ -3475,6 +3515,9 @@ async def preview_ticket_category(request: dict):
         
         # Process populated fields to resolve dynamic values
         populated_fields = category_config.get("populated_fields", {}).copy()
+        # Domain and customer mapping are resolved once, on the first field that needs them
+        domain = customer_email.split('@')[-1] if customer_email and '@' in customer_email else 'unknown.com'
+        customer_mapping = None
         for field, value in populated_fields.items():
             if isinstance(value, str):
                 if value.lower() == 'current_date':
@@ -3482,17 +3525,13 @@ async def preview_ticket_category(request: dict):
                     populated_fields[field] = get_ist_time().strftime('%Y-%m-%d')
                 elif 'based on customer organization' in value.lower():
                     # Get the actual organization name from customer role manager
-                    from customer_role_manager import CustomerRoleMappingManager
-                    customer_manager = CustomerRoleMappingManager()
-                    domain = customer_email.split('@')[-1] if customer_email and '@' in customer_email else 'unknown.com'
-                    customer_mapping = customer_manager.get_customer_mapping(domain)
+                    if customer_mapping is None:
+                        customer_mapping = ticket_creator.customer_role_manager.get_customer_mapping(domain)
                     populated_fields[field] = customer_mapping.get('organization', customer)
                 elif 'based on customer sheet mapping' in value.lower():
                     # Determine MNHT or MNLS based on customer sheet mapping
-                    from customer_role_manager import CustomerRoleMappingManager
-                    customer_manager = CustomerRoleMappingManager()
-                    domain = customer_email.split('@')[-1] if customer_email and '@' in customer_email else 'unknown.com'
-                    customer_mapping = customer_manager.get_customer_mapping(domain)
+                    if customer_mapping is None:
+                        customer_mapping = ticket_creator.customer_role_manager.get_customer_mapping(domain)
                     sheet = customer_mapping.get('sheet', 'HT')
                     if sheet.upper() == 'LS':
                         populated_fields[field] = 'MNLS'
@@ -3500,7 +3539,7 @@ async def preview_ticket_category(request: dict):
                         populated_fields[field] = 'MNHT'
                 elif 'based on description' in value.lower():
                     # Generate summary based on query
-                    populated_fields[field] = f"Support Request: {query[:80]}{'...' if len(query) > 80 else ''}"
+                    populated_fields[field] = support_summary(query)
         
         return {
             "status": "success",
@@ -3523,7 +3562,6 @@ async def summarize_conversation(request: dict):
     """Generate a concise summary of a conversation for ticket creation"""
     try:
         from main import IntelligentQueryProcessor
-        import json
         
         messages = request.get("messages", [])
         query = request.get("query", "")
@@ -3576,11 +3614,11 @@ Summary:"""
         
         response = bedrock_client.invoke_model(
             modelId=model_id,
-            body=json.dumps(body),
+            body=bedrock_dumps(body),
             contentType='application/json'
         )
         
-        response_body = json.loads(response['body'].read())
+        response_body = bedrock_loads(response['body'].read())
         
         if 'content' in response_body and len(response_body['content']) > 0:
             summary = response_body['content'][0]['text'].strip()
@@ -3677,7 +3715,6 @@ async def get_recent_tickets(organization: str):
         
     except Exception as e:
         print(f"❌ Error fetching recent tickets for {organization}: {e}")
-        import traceback
         traceback.print_exc()
         
         # Return empty list on error
@@ -3702,7 +3739,8 @@ async def collect_feedback(request: dict):
         if chat_history_manager:
             # Add feedback as a special message type
             feedback_message = f"[FEEDBACK] {feedback_type.upper()} ({feedback_category})"
-            chat_history_manager.add_message(user_id, "feedback", feedback_message, session_id)
+            # Feedback markers are never read back in this request - fire-and-forget write
+            chat_history_manager.add_message(user_id, "feedback", feedback_message, session_id, acknowledged=False)
         
         # 🧠 REAL LEARNING: Use the learning manager to store and analyze feedback
         learning_manager = get_learning_manager()
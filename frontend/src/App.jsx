@@ -344,11 +344,11 @@ const App = () => {
   }
 
   // Handle feedback submission for continuous learning
-  const handleFeedbackSubmitted = (feedbackType, feedbackCategory) => {
+  const handleFeedbackSubmitted = useCallback((feedbackType, feedbackCategory) => {
     console.log('Feedback submitted:', { feedbackType, feedbackCategory })
     // You can show a toast notification or update UI state here
     // The feedback has already been sent to the backend by FeedbackButtons component
-  }
+  }, [])
 
   const handleAudioToggleForMessage = useCallback((messageId, enabled) => {
     // For now, we'll use individual message audio settings
@@ -1,8 +1,24 @@
-import React, { useState, useEffect } from 'react'
+import React, { useState, useEffect, useMemo } from 'react'
 import { Copy, CheckCircle, User, Bot, Expand } from 'lucide-react'
 import FeedbackButtons from '../feedback/FeedbackButtons'
 import AudioFeedback from '../audio/AudioFeedback'
 
+const formatBotContent = (text) => {
+  return text
+    // Bold text with **
+    .replace(/\*\*(.*?)\*\*/g, '<strong class="font-semibold">$1</strong>')
+    // Italic text with *
+    .replace(/\*(.*?)\*/g, '<em class="italic">$1</em>')
+    // Inline code with `
+    .replace(/`(.*?)`/g, '<code class="bg-gray-100 px-1 py-0.5 rounded text-sm font-mono">$1</code>')
+    // Line breaks
+    .replace(/\n/g, '<br>')
+    // Bullet points
+    .replace(/^- (.+)$/gm, '<div class="flex items-start mt-1"><span class="text-blue-500 mr-2 mt-0.5">•</span><span>$1</span></div>')
+    // Numbered lists
+    .replace(/^(\d+)\. (.+)$/gm, '<div class="flex items-start mt-1"><span class="text-blue-500 mr-2 mt-0.5 font-semibold">$1.</span><span>$2</span></div>')
+}
+
 const ChatMessage = ({ 
   message, 
   isBot = false, 
@@ -46,21 +62,11 @@ const ChatMessage = ({
     }
   }
 
-  const formatBotContent = (text) => {
-    return text
-      // Bold text with **
-      .replace(/\*\*(.*?)\*\*/g, '<strong class="font-semibold">$1</strong>')
-      // Italic text with *
-      .replace(/\*(.*?)\*/g, '<em class="italic">$1</em>')
-      // Inline code with `
-      .replace(/`(.*?)`/g, '<code class="bg-gray-100 px-1 py-0.5 rounded text-sm font-mono">$1</code>')
-      // Line breaks
-      .replace(/\n/g, '<br>')
-      // Bullet points
-      .replace(/^- (.+)$/gm, '<div class="flex items-start mt-1"><span class="text-blue-500 mr-2 mt-0.5">•</span><span>$1</span></div>')
-      // Numbered lists
-      .replace(/^(\d+)\. (.+)$/gm, '<div class="flex items-start mt-1"><span class="text-blue-500 mr-2 mt-0.5 font-semibold">$1.</span><span>$2</span></div>')
-  }
+  // Only re-run the markdown regexes when this message's content changes
+  const formattedContent = useMemo(
+    () => (isBot ? formatBotContent(content) : ''),
+    [isBot, content]
+  )
 
   return (
     <div className={`mb-6 animate-fade-in ${isBot ? 'animate-slide-in-left' : 'animate-slide-in-right'}`}>
@@ -146,7 +152,7 @@ const ChatMessage = ({
                     className={`prose prose-sm max-w-none text-gray-800 leading-relaxed transition-opacity duration-300 ${message.isLoading ? 'opacity-70' : 'opacity-100'}`}
                     style={{ fontSize: '14px', lineHeight: '1.6' }}
                     dangerouslySetInnerHTML={{ 
-                      __html: formatBotContent(content)
+                      __html: formattedContent
                     }}
                   />
                   
@@ -218,4 +224,5 @@ const ChatMessage = ({
   )
 }
 
-export default ChatMessage
\ No newline at end of file
+// Memoized so appending a message does not re-render the whole history
+export default React.memo(ChatMessage)
\ No newline at end of file
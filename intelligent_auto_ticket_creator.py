@@ -8,7 +8,7 @@ import boto3
 import os
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-from ticket_creator import TicketCreator
+from ticket_creator import TicketCreator, customer_name_for_domain, ensure_output_dir, field_label
 
 class IntelligentAutoTicketCreator(TicketCreator):
     """
@@ -463,18 +463,12 @@ Respond in JSON format:
         try:
             # Extract customer info
             customer_domain = customer_email.split('@')[-1] if customer_email else 'unknown.com'
-            domain_to_customer = {
-                'amd.com': 'AMD',
-                'novartis.com': 'Novartis',
-                'wdc.com': 'Wdc',
-                'abbott.com': 'Abbott',
-                'abbvie.com': 'Abbvie',
-                'amgen.com': 'Amgen'
-            }
-            customer = domain_to_customer.get(customer_domain, customer_domain.split('.')[0].capitalize())
+            customer = customer_name_for_domain(customer_domain)
             
             # Generate ticket data
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # One clock read so the ticket id and created date agree
+            now = datetime.now()
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
             ticket_id = f"TICKET_{category}_{customer}_{timestamp}"
             
             # Generate JIRA ticket ID
@@ -487,8 +481,7 @@ Respond in JSON format:
             if collected_answers:
                 technical_details = []
                 for field, value in collected_answers.items():
-                    field_label = field.replace('_', ' ').title()
-                    technical_details.append(f"• {field_label}: {value}")
+                    technical_details.append(f"• {field_label(field)}: {value}")
                 
                 if technical_details:
                     detailed_description += f"\n\n**Technical Details:**\n" + "\n".join(technical_details)
@@ -500,7 +493,7 @@ Respond in JSON format:
                 'customer': customer,
                 'customer_email': customer_email,
                 'original_query': original_query,
-                'created_date': datetime.now().isoformat(),
+                'created_date': now.isoformat(),
                 'priority': priority,
                 'description': detailed_description
             }
@@ -535,15 +528,7 @@ Respond in JSON format:
         try:
             # Extract customer info
             customer_domain = customer_email.split('@')[-1] if customer_email else 'unknown.com'
-            domain_to_customer = {
-                'amd.com': 'AMD',
-                'novartis.com': 'Novartis',
-                'wdc.com': 'Wdc',
-                'abbott.com': 'Abbott',
-                'abbvie.com': 'Abbvie',
-                'amgen.com': 'Amgen'
-            }
-            customer = domain_to_customer.get(customer_domain, customer_domain.split('.')[0].capitalize())
+            customer = customer_name_for_domain(customer_domain)
             
             # Use AI-determined category or fallback to domain mapping
             category = analysis.get('category')
@@ -551,7 +536,9 @@ Respond in JSON format:
                 category = self.determine_ticket_category(query, customer, customer_email)
             
             # Generate ticket data
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # One clock read so the ticket id and created date agree
+            now = datetime.now()
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
             ticket_id = f"TICKET_{category}_{customer}_{timestamp}"
             
             ticket_data = {
@@ -560,7 +547,7 @@ Respond in JSON format:
                 'customer': customer,
                 'customer_email': customer_email,
                 'original_query': query,
-                'created_date': datetime.now().isoformat(),
+                'created_date': now.isoformat(),
                 'creation_method': 'automatic_ai',
                 'ai_analysis': analysis,
                 'completeness_score': analysis.get('completeness_score', 1.0)
@@ -582,22 +569,7 @@ Respond in JSON format:
                 ticket_data['environment'] = analysis['environment']
             
             # Add auto-populated fields based on category
-            auto_fields = self.get_populated_fields_for_category(category)
-            for field, value in auto_fields.items():
-                if field not in ticket_data:
-                    # Resolve dynamic values
-                    if isinstance(value, str):
-                        if 'based on description' in value.lower():
-                            ticket_data[field] = f"Support Request: {query[:80]}{'...' if len(query) > 80 else ''}"
-                        elif 'based on customer organization' in value.lower():
-                            customer_mapping = self.customer_role_manager.get_customer_mapping(customer_domain)
-                            ticket_data[field] = customer_mapping.get('organization', customer)
-                        elif 'current_date' in value.lower():
-                            ticket_data[field] = datetime.now().strftime('%Y-%m-%d')
-                        else:
-                            ticket_data[field] = value
-                    else:
-                        ticket_data[field] = value
+            self._auto_populate(category, ticket_data, query, customer, customer_email, now)
             
             # Save ticket to file
             self.save_ticket_to_file(ticket_data)
@@ -728,13 +700,12 @@ Our support team will review your request and respond accordingly. You can downl
         # Fallback if AI analysis fails
         return self.create_ticket(query, customer_email)
 
-    def save_ticket_to_file(self, ticket_data: Dict) -> str:
-        """Save ticket to file with enhanced format"""
-        output_dir = 'ticket_simulation_output'
-        os.makedirs(output_dir, exist_ok=True)
+    def save_ticket_to_file(self, ticket_data: Dict, timestamp: str = None) -> str:
+        """Save ticket to file with enhanced format (same signature as TicketCreator.save_ticket_to_file)"""
+        output_dir = ensure_output_dir('ticket_simulation_output')
         
         ticket_id = ticket_data.get('ticket_id', 'UNKNOWN')
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
         # Use ticket type indicator instead of creation_method
         filename = f"ticket_automatic_ai_{ticket_id.replace('TICKET_', '')}_{timestamp}.txt"
         filepath = os.path.join(output_dir, filename)
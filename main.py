@@ -16,12 +16,13 @@ New Flow: JIRA (organization-specific) → MindTou            else:
 from typing import Dict, List, Any, Optional, TypedDict, Tuple
 import boto3
 import json
+import re
 from datetime import datetime
 from langgraph.graph import StateGraph, START, END
 
 from semantic_search import SemanticSearch
 from response_formatter import ResponseFormatter
-from ticket_creator import TicketCreator
+from ticket_creator import TicketCreator, support_summary
 from tools.mindtouch_tool import MindTouchTool
 from tools.jira_tool import JiraTool
 from tools.zendesk_tool import ZendeskTool
@@ -33,6 +34,35 @@ from customer_role_manager import CustomerRoleMappingManager
 # Configuration
 FALLBACK_SEARCH_ENABLED = False  # Disabled - relying on new flow
 
+# Explicit ticket creation phrases - compiled into a single alternation so each
+# query is scanned once instead of once per phrase (longest phrases first)
+EXPLICIT_TICKET_REQUESTS = (
+    'create ticket', 'create a ticket', 'make ticket', 'make a ticket',
+    'submit ticket', 'submit a ticket', 'open ticket', 'open a ticket',
+    'file ticket', 'file a ticket', 'ticket creation', 'support ticket',
+    'create support ticket', 'open support ticket', 'submit support ticket',
+    'i need a ticket', 'i want a ticket', 'can you create a ticket',
+    'please create a ticket', 'help me create a ticket',
+    'log a ticket', 'raise a ticket', 'escalate to ticket'
+)
+EXPLICIT_TICKET_REQUEST_PATTERN = re.compile(
+    '|'.join(re.escape(phrase) for phrase in sorted(EXPLICIT_TICKET_REQUESTS, key=len, reverse=True))
+)
+
+# Heading the response formatter uses when a ticket still needs field values
+FIELD_COLLECTION_MARKER = "Additional Information Required"
+
+# Bot prompts that offer ticket creation in a previous response
+TICKET_PROMPT_PATTERN = re.compile('|'.join(re.escape(prompt) for prompt in (
+    'would you like me to create a support ticket',
+    'would you like to create a ticket',
+    'create a support ticket for assistance',
+    'would you like me to create',
+    'create a ticket',
+    'if you are not satisfied',
+    'for further assistance'
+)))
+
 
 class QueryState(TypedDict):
     """State model for the LangGraph workflow"""
@@ -581,7 +611,7 @@ class IntelligentQueryProcessor:
             
             # Prepare ticket data
             ticket_data = {
-                'summary': f"Support Request: {query[:80]}{'...' if len(query) > 80 else ''}",
+                'summary': support_summary(query),
                 'description': f"Customer Query: {query}\n\nCustomer Email: {customer_email}\nOrganization: {self.customer_info.get('organization', 'Unknown')}",
                 'priority': 'normal',
                 'type': 'question',
@@ -957,6 +987,8 @@ Our support team will review your ticket and respond soon. You can track progres
                     )
 
                     if ticket_key:
+                        # The new ticket belongs in every cached recent-tickets list
+                        self.ticket_creator.invalidate_recent_tickets()
                         state['ticket_created'] = ticket_key
                         state['formatted_response'] = (
                             f"\n🎫 Support Ticket Created Successfully!\n\n"
@@ -1015,21 +1047,10 @@ Our support team will review your ticket and respond soon. You can track progres
         query_lower = query.lower().strip()
         
         # EXPLICIT TICKET CREATION REQUESTS - These work anytime, even without prompts
-        explicit_ticket_requests = [
-            'create ticket', 'create a ticket', 'make ticket', 'make a ticket',
-            'submit ticket', 'submit a ticket', 'open ticket', 'open a ticket',
-            'file ticket', 'file a ticket', 'ticket creation', 'support ticket',
-            'create support ticket', 'open support ticket', 'submit support ticket',
-            'i need a ticket', 'i want a ticket', 'can you create a ticket',
-            'please create a ticket', 'help me create a ticket',
-            'log a ticket', 'raise a ticket', 'escalate to ticket'
-        ]
-        
-        # Check for explicit ticket creation requests (these work independently)
-        for request in explicit_ticket_requests:
-            if request in query_lower:
-                print(f"🎫 Detected explicit ticket creation request: '{request}'")
-                return True
+        match = EXPLICIT_TICKET_REQUEST_PATTERN.search(query_lower)
+        if match:
+            print(f"🎫 Detected explicit ticket creation request: '{match.group(0)}'")
+            return True
         
         # AFFIRMATIVE RESPONSES TO SYSTEM PROMPTS
         affirmative_responses = [
@@ -1038,22 +1059,11 @@ Our support team will review your ticket and respond soon. You can track progres
         ]
         
         # Check if previous response contained a ticket creation prompt
-        if previous_response:
-            ticket_prompts = [
-                'would you like me to create a support ticket',
-                'would you like to create a ticket',
-                'create a support ticket for assistance',
-                'would you like me to create',
-                'create a ticket',
-                'if you are not satisfied',
-                'for further assistance'
-            ]
-            
-            if any(prompt in previous_response.lower() for prompt in ticket_prompts):
-                # If previous response had a ticket prompt and current query is affirmative
-                if query_lower in affirmative_responses:
-                    print(f"🎫 Detected affirmative response to ticket creation prompt")
-                    return True
+        if previous_response and TICKET_PROMPT_PATTERN.search(previous_response.lower()):
+            # If previous response had a ticket prompt and current query is affirmative
+            if query_lower in affirmative_responses:
+                print(f"🎫 Detected affirmative response to ticket creation prompt")
+                return True
         
         # Check if query is a simple affirmative response without context (likely a yes to ticket creation)
         if query_lower in affirmative_responses and len(query_lower) <= 8:
@@ -1162,8 +1172,9 @@ Our support team will review your ticket and respond soon. You can track progres
                 collected_fields=collected_fields
             )
             
-            # Check if response is asking for more fields (field collection prompt)
-            if "Additional Information Required" in ticket_response:
+            # Check once whether the response is asking for more fields (field collection prompt)
+            needs_more_fields = FIELD_COLLECTION_MARKER in ticket_response
+            if needs_more_fields:
                 # Still need more fields
                 response_msg = f"📝 Thank you for the information! {ticket_response}"
             else:
@@ -1176,10 +1187,10 @@ Our support team will review your ticket and respond soon. You can track progres
             
             return {
                 "query": query,
-                "source": "FIELD_COLLECTION" if "Additional Information Required" in ticket_response else "TICKET_CREATION",
+                "source": "FIELD_COLLECTION" if needs_more_fields else "TICKET_CREATION",
                 "results_found": 1,
                 "response": response_msg,
-                "ticket_created": ticket_response if "Additional Information Required" not in ticket_response else None,
+                "ticket_created": ticket_response if not needs_more_fields else None,
                 "error": None,
                 "chat_history": self.chat_history_manager.get_history(user_id)
             }
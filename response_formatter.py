@@ -5,15 +5,32 @@ Response formatter module for creating user-friendly responses
 import boto3
 import json
 import os
+import re
 from typing import List, Dict, Tuple, Optional
 from dotenv import load_dotenv
 from datetime import datetime
 from config import AWS_REGION, BEDROCK_MODEL
 from organization_access_controller import check_organization_access
 from customer_role_manager import CustomerRoleMappingManager
+from ticket_creator import support_summary
 
 load_dotenv()
 
+# Field-response parsing tables, built once at import instead of per parse_field_response call
+FIELD_RESPONSE_PATTERNS = {
+    'area': ('area:', 'area', 'affected area:', 'module:', 'component:'),
+    'affected_version': ('version:', 'affected version:', 'version affected:', 'ver:', 'release:'),
+    'reported_environment': ('environment:', 'env:', 'reported environment:', 'environment affected:')
+}
+EMPTY_FIELD_VALUES = frozenset({'n/a', 'na', 'none', 'blank', ''})
+VERSION_NUMBER_PATTERN = re.compile(r'\b(\d+\.\d+(?:\.\d+)?)\b')
+ENVIRONMENT_KEYWORDS = ('production', 'prod', 'staging', 'test', 'development', 'dev', 'uat')
+AREA_INDICATORS = frozenset({'user', 'management', 'access', 'reporting', 'configuration', 'sync', 'integration'})
+AREA_STOP_WORDS = frozenset({'the', 'and', 'for', 'with'})
+
+# Simplified keyword list for spotting solution-bearing JIRA comments
+JIRA_SOLUTION_KEYWORDS = ('solution', 'resolved', 'fix', 'steps', 'workaround', 'error')
+
 class ResponseFormatter:
     def get_required_fields_for_query(self, query: str, user_email: str = "") -> List[str]:
         """
@@ -148,30 +165,26 @@ class ResponseFormatter:
                 if comments:
                     jira_content += "\n\nRECENT COMMENTS WITH SOLUTIONS:"
                     relevant_comments_found = 0
-                    # Process only last 3 comments for performance
+                    # Process only last 3 comments for performance, truncating each body once
+                    recent_comments = []
                     for comment in comments[-3:]:  # Reduced from 5 to 3 for performance
                         comment_body = comment.get('body', '')
-                        # Truncate comment body early
                         if len(comment_body) > 200:
                             comment_body = comment_body[:200] + "..."
-                            
-                        # Simplified keyword list for performance
-                        solution_keywords = ['solution', 'resolved', 'fix', 'steps', 'workaround', 'error']
-                        
-                        if any(keyword in comment_body.lower() for keyword in solution_keywords) or len(comment_body) > 50:
-                            jira_content += f"\n- {comment.get('author', 'User')}: {comment_body}"
+                        recent_comments.append((comment.get('author', 'User'), comment_body))
+                    
+                    for author, comment_body in recent_comments:
+                        if any(keyword in comment_body.lower() for keyword in JIRA_SOLUTION_KEYWORDS) or len(comment_body) > 50:
+                            jira_content += f"\n- {author}: {comment_body}"
                             relevant_comments_found += 1
                     
                     # If no "relevant" comments found, include fewer recent comments for performance
                     if relevant_comments_found == 0:
                         jira_content += "\n\nRECENT COMMENTS:"
-                        for comment in comments[-2:]:  # Reduced from 3 to 2
-                            comment_body = comment.get('body', '')
+                        # Reuse the already-truncated bodies of the last 2 comments
+                        for author, comment_body in recent_comments[-2:]:  # Reduced from 3 to 2
                             if comment_body:
-                                # Truncate to 200 chars for performance
-                                if len(comment_body) > 200:
-                                    comment_body = comment_body[:200] + "..."
-                                jira_content += f"\n- {comment.get('author', 'User')}: {comment_body}"
+                                jira_content += f"\n- {author}: {comment_body}"
                 
                 content = jira_content
             elif source in ['ZENDESK', 'ZENDESK_AZURE', 'MULTI'] and doc.get('platform') == 'Zendesk':
@@ -676,7 +689,7 @@ Would you like to:
         ticket_id = f"{category}-{hashlib.md5(query.encode()).hexdigest()[:6].upper()}"
         
         # Generate summary based on description
-        summary = f"Support Request: {query[:80]}{'...' if len(query) > 80 else ''}"
+        summary = support_summary(query)
         
         # Base ticket data
         ticket_data = {
@@ -753,43 +766,34 @@ Would you like to:
         """
         fields = {}
         
-        # Common field patterns to look for
-        field_patterns = {
-            'area': ['area:', 'area', 'affected area:', 'module:', 'component:'],
-            'affected_version': ['version:', 'affected version:', 'version affected:', 'ver:', 'release:'],
-            'reported_environment': ['environment:', 'env:', 'reported environment:', 'environment affected:']
-        }
-        
         response_lower = response.lower()
         lines = response.split('\n')
         
         # Try to parse structured format first (Field: Value)
         for line in lines:
-            line = line.strip()
-            if ':' in line:
-                parts = line.split(':', 1)
-                if len(parts) == 2:
-                    field_name = parts[0].strip().lower()
-                    field_value = parts[1].strip()
-                    
-                    # Map common field names
-                    for standard_field, patterns in field_patterns.items():
-                        if any(pattern in field_name for pattern in patterns):
-                            if field_value and field_value.lower() not in ['n/a', 'na', 'none', 'blank', '']:
-                                fields[standard_field] = field_value
-                            break
+            # Only the first ':' separates the field name from its value
+            field_name, sep, field_value = line.strip().partition(':')
+            if not sep:
+                continue
+            field_name = field_name.strip().lower()
+            field_value = field_value.strip()
+            
+            # Map common field names
+            for standard_field, patterns in FIELD_RESPONSE_PATTERNS.items():
+                if any(pattern in field_name for pattern in patterns):
+                    if field_value and field_value.lower() not in EMPTY_FIELD_VALUES:
+                        fields[standard_field] = field_value
+                    break
         
         # If no structured format, try to extract from free text
         if not fields:
             # Look for version numbers
-            import re
-            version_match = re.search(r'\b(\d+\.\d+(?:\.\d+)?)\b', response)
+            version_match = VERSION_NUMBER_PATTERN.search(response)
             if version_match:
                 fields['affected_version'] = version_match.group(1)
             
             # Look for environment keywords
-            env_keywords = ['production', 'prod', 'staging', 'test', 'development', 'dev', 'uat']
-            for env in env_keywords:
+            for env in ENVIRONMENT_KEYWORDS:
                 if env in response_lower:
                     fields['reported_environment'] = env.title()
                     break
@@ -798,15 +802,14 @@ Would you like to:
             words = response.split()
             if len(words) >= 2:
                 # Look for phrases that might indicate an area
-                area_indicators = ['user', 'management', 'access', 'reporting', 'configuration', 'sync', 'integration']
                 for i, word in enumerate(words):
-                    if word.lower() in area_indicators and i < len(words) - 1:
+                    if word.lower() in AREA_INDICATORS and i < len(words) - 1:
                         fields['area'] = f"{word} {words[i+1]}".title()
                         break
                 
                 # If no area found, use first two meaningful words
                 if 'area' not in fields and len(words) >= 2:
-                    meaningful_words = [w for w in words[:4] if len(w) > 2 and w.lower() not in ['the', 'and', 'for', 'with']]
+                    meaningful_words = [w for w in words[:4] if len(w) > 2 and w.lower() not in AREA_STOP_WORDS]
                     if len(meaningful_words) >= 2:
                         fields['area'] = ' '.join(meaningful_words[:2]).title()
         
@@ -821,7 +824,7 @@ Would you like to:
         ticket_id = f"{category}-{hashlib.md5(query.encode()).hexdigest()[:6].upper()}"
         
         # Generate summary based on description
-        summary = f"Support Request: {query[:80]}{'...' if len(query) > 80 else ''}"
+        summary = support_summary(query)
         
         # Base ticket data
         ticket_data = {
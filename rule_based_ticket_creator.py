@@ -9,7 +9,7 @@ import os
 import re
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-from ticket_creator import TicketCreator
+from ticket_creator import TicketCreator, customer_name_for_domain, ensure_output_dir, field_label
 
 class RuleBasedTicketCreator(TicketCreator):
     """
@@ -225,21 +225,15 @@ class RuleBasedTicketCreator(TicketCreator):
         try:
             # Extract customer info
             customer_domain = customer_email.split('@')[-1] if customer_email else 'unknown.com'
-            domain_to_customer = {
-                'amd.com': 'AMD',
-                'novartis.com': 'Novartis',
-                'wdc.com': 'Wdc',
-                'abbott.com': 'Abbott',
-                'abbvie.com': 'Abbvie',
-                'amgen.com': 'Amgen'
-            }
-            customer = domain_to_customer.get(customer_domain, customer_domain.split('.')[0].capitalize())
+            customer = customer_name_for_domain(customer_domain)
             
             # Use analysis results
             category = analysis.get('category', 'MNHT')
             
             # Generate ticket data
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # One clock read so the ticket id and created date agree
+            now = datetime.now()
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
             ticket_id = f"TICKET_{category}_{customer}_{timestamp}"
             
             ticket_data = {
@@ -248,7 +242,7 @@ class RuleBasedTicketCreator(TicketCreator):
                 'customer': customer,
                 'customer_email': customer_email,
                 'original_query': query,
-                'created_date': datetime.now().isoformat(),
+                'created_date': now.isoformat(),
                 'creation_method': 'automatic_rule_based',
                 'rule_analysis': analysis,
                 'completeness_score': analysis.get('completeness_score', 1.0)
@@ -270,22 +264,7 @@ class RuleBasedTicketCreator(TicketCreator):
                 ticket_data['environment'] = analysis['environment']
             
             # Add auto-populated fields based on category
-            auto_fields = self.get_populated_fields_for_category(category)
-            for field, value in auto_fields.items():
-                if field not in ticket_data:
-                    # Resolve dynamic values
-                    if isinstance(value, str):
-                        if 'based on description' in value.lower():
-                            ticket_data[field] = f"Support Request: {query[:80]}{'...' if len(query) > 80 else ''}"
-                        elif 'based on customer organization' in value.lower():
-                            customer_mapping = self.customer_role_manager.get_customer_mapping(customer_domain)
-                            ticket_data[field] = customer_mapping.get('organization', customer)
-                        elif 'current_date' in value.lower():
-                            ticket_data[field] = datetime.now().strftime('%Y-%m-%d')
-                        else:
-                            ticket_data[field] = value
-                    else:
-                        ticket_data[field] = value
+            self._auto_populate(category, ticket_data, query, customer, customer_email, now)
             
             # Save ticket to file
             self.save_ticket_to_file(ticket_data)
@@ -330,13 +309,12 @@ class RuleBasedTicketCreator(TicketCreator):
             }
         }
     
-    def save_ticket_to_file(self, ticket_data: Dict) -> str:
-        """Save ticket to file with enhanced format"""
-        output_dir = 'ticket_simulation_output'
-        os.makedirs(output_dir, exist_ok=True)
+    def save_ticket_to_file(self, ticket_data: Dict, timestamp: str = None) -> str:
+        """Save ticket to file with enhanced format (same signature as TicketCreator.save_ticket_to_file)"""
+        output_dir = ensure_output_dir('ticket_simulation_output')
         
         ticket_id = ticket_data.get('ticket_id', 'UNKNOWN')
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
         method = ticket_data.get('creation_method', 'standard')
         filename = f"ticket_{method}_{ticket_id.replace('TICKET_', '')}_{timestamp}.txt"
         filepath = os.path.join(output_dir, filename)
@@ -383,8 +361,7 @@ Description: {ticket_data.get('description', 'N/A')}"""
         auto_fields = ['project', 'work_type', 'summary', 'cloud_operations_request_type', 'support_org']
         for field in auto_fields:
             if field in ticket_data:
-                field_name = field.replace('_', ' ').title()
-                content += f"\n{field_name}: {ticket_data[field]}"
+                content += f"\n{field_label(field)}: {ticket_data[field]}"
 
         if rule_analysis and creation_method == 'automatic_rule_based':
             content += f"""
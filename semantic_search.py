@@ -10,6 +10,15 @@ from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 from config import VECTOR_STORE_PATH, SIMILARITY_THRESHOLD
 
+# Loaded sentence-transformer models, shared by every SemanticSearch instance
+_loaded_models = {}
+
+def get_sentence_model(model_name: str = 'all-mpnet-base-v2') -> SentenceTransformer:
+    """Get or load the shared SentenceTransformer for model_name (loaded once per process)"""
+    if model_name not in _loaded_models:
+        _loaded_models[model_name] = SentenceTransformer(model_name)
+    return _loaded_models[model_name]
+
 class SemanticSearch:
     """
     Semantic search engine using sentence transformers and vector similarity
@@ -17,9 +26,12 @@ class SemanticSearch:
     
     def __init__(self, model_name: str = 'all-mpnet-base-v2'):
         # Using a more powerful model for better semantic understanding
-        self.model = SentenceTransformer(model_name)
+        self.model = get_sentence_model(model_name)
         self.vector_store_path = VECTOR_STORE_PATH
         self.similarity_threshold = SIMILARITY_THRESHOLD
+        # Document text -> embedding, so tickets returned by consecutive searches are encoded once
+        self._embedding_cache: Dict[str, np.ndarray] = {}
+        self.embedding_cache_size = 5000
         self._ensure_vector_store_exists()
         
     def _ensure_vector_store_exists(self):
@@ -81,6 +93,34 @@ class SemanticSearch:
         combined_text = '\n'.join(text_parts).strip()
         return combined_text if combined_text else doc.get('title', 'No content')
     
+    def _encode_documents(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode document texts, reusing cached embeddings for texts seen before
+        
+        Args:
+            texts: Prepared document texts
+            
+        Returns:
+            Array of embeddings in the same order as texts
+        """
+        # Take this batch's cache hits first so evicting below cannot drop them
+        embeddings = {}
+        missing = []
+        for text in dict.fromkeys(texts):
+            cached = self._embedding_cache.get(text)
+            if cached is None:
+                missing.append(text)
+            else:
+                embeddings[text] = cached
+        if missing:
+            # Keep memory bounded - start over once the cache would grow past its limit
+            if len(self._embedding_cache) + len(missing) > self.embedding_cache_size:
+                self._embedding_cache.clear()
+            for text, embedding in zip(missing, self.model.encode(missing)):
+                self._embedding_cache[text] = embedding
+                embeddings[text] = embedding
+        return np.array([embeddings[text] for text in texts])
+    
     def _calculate_similarities(self, query: str, documents: List[Dict]) -> List[Tuple[Dict, float]]:
         """
         Calculate cosine similarities between query and documents
@@ -100,7 +140,7 @@ class SemanticSearch:
             texts = [self._prepare_document_text(doc) for doc in documents]
             
             # Generate embeddings for documents and query
-            document_embeddings = self.model.encode(texts)
+            document_embeddings = self._encode_documents(texts)
             query_embedding = self.model.encode([query])
             
             # Calculate cosine similarities
@@ -0,0 +1,52 @@
+"""
+Tests for SemanticSearch's document embedding cache
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("sklearn")
+
+from semantic_search import SemanticSearch
+
+
+class FakeModel:
+    """Stands in for SentenceTransformer: one-dimensional embedding = text length"""
+    
+    def __init__(self):
+        self.encoded = []
+    
+    def encode(self, texts):
+        self.encoded.extend(texts)
+        return np.array([[float(len(text))] for text in texts])
+
+
+def make_search(cache_size):
+    search = SemanticSearch.__new__(SemanticSearch)
+    search.model = FakeModel()
+    search._embedding_cache = {}
+    search.embedding_cache_size = cache_size
+    return search
+
+
+def test_encode_documents_past_cache_size_keeps_cached_hits():
+    search = make_search(cache_size=3)
+    search._encode_documents(["a", "bb", "ccc"])
+    
+    # Mixes cached texts with new ones and pushes the cache past its bound
+    texts = ["a", "dddd", "ccc", "eeeee"]
+    embeddings = search._encode_documents(texts)
+    
+    assert embeddings.tolist() == [[1.0], [4.0], [3.0], [5.0]]
+    assert search.model.encoded == ["a", "bb", "ccc", "dddd", "eeeee"]
+    assert len(search._embedding_cache) <= 3
+
+
+def test_encode_documents_reuses_cached_embeddings():
+    search = make_search(cache_size=10)
+    search._encode_documents(["a", "bb"])
+    embeddings = search._encode_documents(["bb", "a", "bb"])
+    
+    assert embeddings.tolist() == [[2.0], [1.0], [2.0]]
+    assert search.model.encoded == ["a", "bb"]
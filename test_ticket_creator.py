@@ -0,0 +1,56 @@
+"""
+Tests for TicketCreator.create_ticket on the ticket creator subclasses
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+import ticket_creator
+from rule_based_ticket_creator import RuleBasedTicketCreator
+
+
+class StubRuleBasedTicketCreator(RuleBasedTicketCreator):
+    """Rule-based creator with the Excel mapping and interactive prompts stubbed out"""
+    
+    def __init__(self):
+        self._display_spec_by_cat = {}
+    
+    def _customer_from_email(self, customer_email):
+        return "AMD"
+    
+    def determine_ticket_category(self, query, customer, customer_email=None):
+        return "MNHT"
+    
+    def collect_user_input_for_category(self, category, query, customer, customer_email):
+        return {'description': query}
+    
+    def get_populated_fields_for_category(self, category):
+        return {'project': 'MNHT'}
+
+
+def test_create_ticket_on_subclass_writes_simulation_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(ticket_creator, "TICKET_OUTPUT_DIR", str(tmp_path))
+    
+    ticket_data = StubRuleBasedTicketCreator().create_ticket("Login page is down")
+    
+    files = os.listdir(tmp_path)
+    assert len(files) == 1
+    assert files[0].startswith("ticket_demo_MNHT_AMD_")
+    content = (tmp_path / files[0]).read_text(encoding='utf-8')
+    assert content.startswith("TICKET SIMULATION OUTPUT\n")
+    assert f"Ticket ID: {ticket_data['ticket_id']}\n" in content
+    assert "Project: MNHT\n" in content
+
+
+def test_get_recent_tickets_returns_copies_of_cached_tickets(monkeypatch):
+    cached = [{'key': 'MNHT-1', 'summary': 'Login page is down'}]
+    monkeypatch.setattr(ticket_creator.TicketCreator, "_recent_tickets_cache",
+                        {('AMD', 10): (ticket_creator.time.monotonic(), cached)})
+    creator = StubRuleBasedTicketCreator()
+    
+    creator.get_recent_tickets('AMD')[0]['summary'] = 'changed'
+    
+    assert creator.get_recent_tickets('AMD') == [{'key': 'MNHT-1', 'summary': 'Login page is down'}]
@@ -6,13 +6,33 @@ This script tests the connection to Zendesk API and retrieves basic information.
 
 import requests
 import os
+import sys
 import json
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Load environment variables from .env file
 load_dotenv()
 
-def test_zendesk_connection():
+# Only prompt when a person is at the terminal; batch/CI runs take the defaults
+INTERACTIVE = sys.stdin.isatty() and not os.environ.get('CI')
+
+# Separator lines, built once rather than on every print
+_RULE = "-" * 50
+_BANNER = "=" * 60
+
+def create_session(auth):
+    """Create a pooled Zendesk session so consecutive calls reuse one keep-alive connection."""
+    session = requests.Session()
+    session.auth = auth
+    session.headers.update({'Accept': 'application/json'})
+    retry = Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504])
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry))
+    return session
+
+def test_zendesk_connection(session=None):
     """Test Zendesk API connection and retrieve basic information."""
     
     # Load credentials from environment variables
@@ -31,18 +51,29 @@ def test_zendesk_connection():
     print("🔧 Testing Zendesk API Connection...")
     print(f"📍 Subdomain: {subdomain}")
     print(f"👤 User Email: {user_email}")
-    print("-" * 50)
+    print(_RULE)
     
     # Construct the base URL
     base_url = f'https://{subdomain}.zendesk.com/api/v2'
     
     # Authentication setup
     auth = (f'{user_email}/token', api_token)
+    session = session or create_session(auth)
+    
+    # The four probes are independent, so issue them concurrently and report in order
+    probe_paths = {
+        'user': 'users/me.json',
+        'tickets': 'tickets.json?page[size]=100',  # Cursor pagination, max page size
+        'groups': 'groups.json',
+        'settings': 'account/settings.json',
+    }
+    with ThreadPoolExecutor(max_workers=len(probe_paths)) as executor:
+        probes = {name: executor.submit(session.get, f'{base_url}/{path}') for name, path in probe_paths.items()}
     
     # Test 1: Get current user information
     print("🔍 Test 1: Getting current user information...")
     try:
-        response = requests.get(f'{base_url}/users/me.json', auth=auth)
+        response = probes['user'].result()
         
         if response.status_code == 200:
             user_data = response.json()
@@ -60,12 +91,12 @@ def test_zendesk_connection():
         print(f"❌ Connection error: {e}")
         return False
     
-    print("-" * 50)
+    print(_RULE)
     
-    # Test 2: Get tickets (limited to 5 for testing)
+    # Test 2: Get tickets (one full cursor page)
     print("🎫 Test 2: Getting recent tickets...")
     try:
-        response = requests.get(f'{base_url}/tickets.json?per_page=5', auth=auth)
+        response = probes['tickets'].result()
         
         if response.status_code == 200:
             tickets_data = response.json()
@@ -83,12 +114,12 @@ def test_zendesk_connection():
     except requests.exceptions.RequestException as e:
         print(f"❌ Connection error: {e}")
     
-    print("-" * 50)
+    print(_RULE)
     
     # Test 3: Get groups
     print("👥 Test 3: Getting groups...")
     try:
-        response = requests.get(f'{base_url}/groups.json', auth=auth)
+        response = probes['groups'].result()
         
         if response.status_code == 200:
             groups_data = response.json()
@@ -105,12 +136,12 @@ def test_zendesk_connection():
     except requests.exceptions.RequestException as e:
         print(f"❌ Connection error: {e}")
     
-    print("-" * 50)
+    print(_RULE)
     
     # Test 4: Get account info
     print("🏢 Test 4: Getting account information...")
     try:
-        response = requests.get(f'{base_url}/account/settings.json', auth=auth)
+        response = probes['settings'].result()
         
         if response.status_code == 200:
             settings_data = response.json()
@@ -126,11 +157,11 @@ def test_zendesk_connection():
     except requests.exceptions.RequestException as e:
         print(f"❌ Connection error: {e}")
     
-    print("-" * 50)
+    print(_RULE)
     print("🎉 Zendesk API test completed!")
     return True
 
-def create_test_ticket():
+def create_test_ticket(session=None):
     """Create a test ticket to verify write permissions."""
     
     api_token = os.getenv('ZENDESK_API_TOKEN')
@@ -139,6 +170,7 @@ def create_test_ticket():
     
     base_url = f'https://{subdomain}.zendesk.com/api/v2'
     auth = (f'{user_email}/token', api_token)
+    session = session or create_session(auth)
     
     print("🎫 Test: Creating a test ticket...")
     
@@ -154,10 +186,9 @@ def create_test_ticket():
     }
     
     try:
-        response = requests.post(
+        response = session.post(
             f'{base_url}/tickets.json',
             json=ticket_data,
-            auth=auth,
             headers={'Content-Type': 'application/json'}
         )
         
@@ -178,21 +209,24 @@ def create_test_ticket():
         return None
 
 if __name__ == "__main__":
-    print("=" * 60)
+    print(_BANNER)
     print("🚀 ZENDESK API CONNECTION TEST")
-    print("=" * 60)
+    print(_BANNER)
+    
+    # Share one pooled session between the connection test and ticket creation
+    session = create_session((f"{os.getenv('ZENDESK_USER_EMAIL')}/token", os.getenv('ZENDESK_API_TOKEN')))
     
     # Test basic connection
-    success = test_zendesk_connection()
+    success = test_zendesk_connection(session)
     
     if success:
-        print("\n" + "=" * 60)
+        print("\n" + _BANNER)
         
-        # Ask if user wants to create a test ticket
-        user_input = input("Do you want to create a test ticket? (y/n): ").lower().strip()
+        # Ask if user wants to create a test ticket (never in non-interactive runs)
+        user_input = input("Do you want to create a test ticket? (y/n): ").lower().strip() if INTERACTIVE else 'n'
         
         if user_input in ['y', 'yes']:
-            ticket_id = create_test_ticket()
+            ticket_id = create_test_ticket(session)
             if ticket_id:
                 print(f"\n💡 Note: You can view the test ticket at:")
                 print(f"   https://{os.getenv('ZENDESK_SUBDOMAIN')}.zendesk.com/agent/tickets/{ticket_id}")
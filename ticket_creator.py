@@ -3,48 +3,326 @@ Ticket creator module for creating support tickets when no relevant information
 """
 
 from typing import Dict, Optional
-import json
 import os
+import re
+import secrets
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from customer_role_manager import CustomerRoleMappingManager
-from organization_access_controller import check_organization_access
+from functools import lru_cache, partial
+from types import MappingProxyType
+from config import DEBUG_LOGGING
+
+# orjson for bulk JSONL ticket records when available (stdlib json fallback)
+try:
+    import orjson
+    
+    def _ticket_record(ticket: Dict) -> bytes:
+        return orjson.dumps(ticket, default=str, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    import json
+    
+    def _ticket_record(ticket: Dict) -> bytes:
+        return (json.dumps(ticket, default=str) + "\n").encode('utf-8')
+
+# Aho-Corasick keyword matching when pyahocorasick is installed (pure-Python scan otherwise)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Separator lines for console output, built once instead of per call
+_EQ50 = "=" * 50
+_EQ60 = "=" * 60
+_DASH60 = "-" * 60
+_DASH40 = "-" * 40
+
+# Fields collected by get_ticket_fields_from_user and checked by validate_ticket_data
+_REQUIRED_FIELDS = frozenset({'summary', 'description', 'priority', 'issue_type', 'project_key'})
+_OPTIONAL_FIELDS = ('assignee', 'labels', 'components')
+
+# Known customer domains and names - anything else falls back to the capitalized domain
+_DOMAIN_TO_CUSTOMER = MappingProxyType({
+    'amd.com': 'AMD',
+    'novartis.com': 'Novartis',
+    'wdc.com': 'Wdc',
+    'abbott.com': 'Abbott',
+    'abbvie.com': 'Abbvie',
+    'amgen.com': 'Amgen'
+})
+
+# Hardcoded customer name fallback used by determine_ticket_category
+_CUSTOMER_TO_CATEGORY = MappingProxyType({
+    'AMD': 'MNHT',
+    'NOVARTIS': 'MNLS',
+    'WDC': 'MNHT',
+    'ABBOTT': 'MNHT',
+    'ABBVIE': 'MNLS',
+    'AMGEN': 'MNLS'
+})
+
+# Fallback customer mappings by email domain (only used if the Excel system fails)
+_FALLBACK_EMAIL_TO_CATEGORY = MappingProxyType({
+    'amd.com': 'MNHT',
+    'novartis.com': 'MNLS',
+    'wdc.com': 'MNHT',
+    'abbott.com': 'MNHT',
+    'abbvie.com': 'MNLS',
+    'amgen.com': 'MNLS'
+})
+
+# Interactive ticket options, keyed by lowercase answer; values are interned so every
+# ticket shares one string object per option
+_PRIORITIES = {p.lower(): sys.intern(p) for p in ('Highest', 'High', 'Medium', 'Low', 'Lowest')}
+_ISSUE_TYPES = {t.lower(): sys.intern(t) for t in ('Task', 'Bug', 'Story', 'Epic', 'Support')}
+
+# Accepted answers to the environment prompt -> canonical environment
+_ENVIRONMENT_ALIASES = MappingProxyType({
+    **dict.fromkeys(('production', 'prod', 'live', 'p', '1'), 'production'),
+    **dict.fromkeys(('staging', 'stage', 'test', 'dev', 'development', 's', '2'), 'staging'),
+})
+
+# Seconds a fetched list of an organization's recent JIRA tickets is reused
+RECENT_TICKETS_TTL = 90
+
+# Where simulated tickets are written
+TICKET_OUTPUT_DIR = os.path.join(os.path.dirname(__file__), 'ticket_simulation_output')
+
+# Bulk mode appends every ticket to one JSONL file; one write per batch
+# (batches stay under the usual IOV_MAX of 1024 for writev)
+BULK_TICKETS_FILE = 'tickets.jsonl'
+BULK_BATCH_SIZE = 1000
+
+# Ticket metadata written in the file header / hidden from field listings
+_META_FIELDS = frozenset({'ticket_id', 'category', 'customer', 'created_date', 'customer_email', 'original_query'})
+# The streamlit file header has no customer email line, so that field stays in its listing
+_STREAMLIT_META_FIELDS = _META_FIELDS - {'customer_email'}
+
+# Ticket file layouts: (header template, fields left out of the body, footer)
+_TICKET_LAYOUTS = {
+    'standard': (
+        "TICKET SIMULATION OUTPUT\n"
+        "========================\n"
+        "\n"
+        "Ticket ID: {ticket_id}\n"
+        "Category: {category}\n"
+        "Customer: {customer}\n"
+        "Created: {created}\n"
+        "Customer Email: {customer_email}\n"
+        "Original Query: {original_query}\n"
+        "\n"
+        "TICKET DETAILS:\n"
+        "===============\n",
+        _META_FIELDS,
+        "",
+    ),
+    'streamlit': (
+        f"{_EQ60}\n"
+        "TICKET SIMULATION - STREAMLIT CREATED\n"
+        f"{_EQ60}\n"
+        "Ticket ID: {ticket_id}\n"
+        "Category: {category}\n"
+        "Customer: {customer}\n"
+        "Created: {created}\n"
+        "Original Query: {original_query}\n"
+        f"{_DASH60}\n"
+        "TICKET FIELDS:\n"
+        f"{_DASH60}\n",
+        _STREAMLIT_META_FIELDS,
+        f"{_EQ60}\n",
+    ),
+}
+
+# Comma-separated answers (labels, components) split and stripped in one pass
+_CSV_SPLIT = re.compile(r"\s*,\s*")
+
+# Fixed prompt block shown before the first question in get_ticket_fields_from_user,
+# written in a single stdout write instead of one print per line
+TICKET_FIELDS_BANNER = (
+    f"\n{_EQ60}\n"
+    "🎫 NO RELEVANT INFORMATION FOUND\n"
+    "Let's create a support ticket for your query.\n"
+    f"{_EQ60}\n"
+    "Original Query: {query}\n"
+    f"{_DASH60}\n"
+    "\n📝 Please provide the following information:\n"
+    "\n1. Summary (suggested: {suggested_summary})\n"
+)
+
+def _match_keyword(keyword_index: tuple, query_lower: str) -> Optional[tuple]:
+    """Return (keyword, category) for the longest keyword found in the query, or None"""
+    # The index is sorted longest first, so the first hit is the most specific keyword
+    for keyword_lower, keyword, category in keyword_index:
+        if keyword_lower in query_lower:
+            return keyword, category
+    return None
+
+def _build_keyword_matcher(keyword_index: tuple):
+    """Build a query_lower -> (keyword, category) matcher that scans the query once for all keywords"""
+    if ahocorasick is None or not keyword_index:
+        return partial(_match_keyword, keyword_index)
+    
+    automaton = ahocorasick.Automaton()
+    for rank, (keyword_lower, keyword, category) in enumerate(keyword_index):
+        # Duplicate keywords keep their first (highest ranked) entry, as in the linear scan
+        if keyword_lower not in automaton:
+            automaton.add_word(keyword_lower, (rank, keyword, category))
+    automaton.make_automaton()
+    
+    def match(query_lower: str) -> Optional[tuple]:
+        # Lowest rank = longest keyword, ties in config order - same winner as _match_keyword
+        best = min((value for _, value in automaton.iter(query_lower)), default=None)
+        return (best[1], best[2]) if best else None
+    
+    return match
+
+# Dynamic populated-field values -> resolver method, checked in this order
+_DYNAMIC_VALUE_HANDLERS = (
+    ('based on description', '_auto_summary'),
+    ('based on user domain', '_auto_domain'),
+    ('based on customer organization', '_auto_organization'),
+    ('based on customer sheet mapping', '_auto_sheet_category'),
+    ('current_date', '_auto_current_date'),
+)
+
+@lru_cache(maxsize=256)
+def _dynamic_handler(value: str) -> Optional[str]:
+    """Resolver method name for a dynamic populated-field value, or None for a literal value"""
+    value_lower = value.lower()
+    # Every placeholder but current_date contains 'based on ' - rule out plain literal values first
+    if 'based on ' not in value_lower and 'current_date' not in value_lower:
+        return None
+    for sentinel, handler in _DYNAMIC_VALUE_HANDLERS:
+        if sentinel in value_lower:
+            return handler
+    return None
+
+@lru_cache(maxsize=None)
+def ensure_output_dir(path: str) -> str:
+    """Create an output directory on first use only - later calls skip the makedirs stat"""
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def customer_name_for_domain(domain: str) -> str:
+    """Customer name for an email domain - known customers first, else the capitalized domain name"""
+    return _DOMAIN_TO_CUSTOMER.get(domain) or domain.split('.', 1)[0].capitalize()
+
+def support_summary(query: str, limit: int = 80) -> str:
+    """'Support Request: <query>' with the query cut to limit characters"""
+    if len(query) > limit:
+        return f"Support Request: {query[:limit]}..."
+    return f"Support Request: {query}"
+
+def _domain_of(email: str) -> str:
+    """Lowercased domain of an email address ('unknown.com' when there is none)"""
+    if email and '@' in email:
+        return email.rpartition('@')[2].lower()
+    return 'unknown.com'
+
+@lru_cache(maxsize=256)
+def field_label(name: str) -> str:
+    """Display label for a ticket field name (issue_type -> Issue Type)"""
+    return name.replace('_', ' ').title()
+
+def _write_buffers(fd: int, buffers: list):
+    """Write all buffers to fd - one writev where supported, finishing any short write"""
+    total = sum(len(buffer) for buffer in buffers)
+    written = os.writev(fd, buffers) if hasattr(os, 'writev') else 0
+    if written < total:
+        remaining = memoryview(b"".join(buffers))[written:]
+        while remaining:
+            remaining = remaining[os.write(fd, remaining):]
+
+def _require_tty(flow: str):
+    """Refuse to start an interactive prompt flow when nobody is at a terminal (server/worker processes)"""
+    if not sys.stdin.isatty():
+        raise RuntimeError(f"interactive ticket flow '{flow}' invoked in non-TTY context")
+
+def _ask(prompt: str, default: str = "") -> str:
+    """Prompt on stdout and read one stripped line from stdin, without going through input()/readline"""
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError("stdin closed while waiting for ticket input")
+    return line.strip() or default
+
+def _choice(answer: str, options: Dict[str, str], default: str) -> str:
+    """Canonical (interned) spelling of an answer from a fixed option set, or the default"""
+    choice = options.get(answer.lower())
+    if choice is None:
+        print(f"   ⚠️ '{answer}' is not one of the options, using {default}")
+        return options[default.lower()]
+    return choice
+
+def _ask_required(prompt: str, retry_prompt: str) -> str:
+    """_ask until a non-empty answer is given; each retry sends the error and prompt as one write"""
+    answer = _ask(prompt)
+    while not answer:
+        answer = _ask(retry_prompt)
+    return answer
 
 class TicketCreator:
     """
     Creates support tickets when no relevant information is found in knowledge bases
     """
     
-    def __init__(self):
-        # Load ticket configuration from Excel (with JSON fallback)
-        from ticket_mapping_manager import TicketMappingManager
-        self.mapping_manager = TicketMappingManager()
-        self.ticket_config = self.mapping_manager.get_mapping()
-        
-        # Initialize dynamic customer role manager
-        self.customer_role_manager = CustomerRoleMappingManager()
-        
-        # Import environment detection utility
-        try:
-            from environment_detection import process_mnht_mnls_environment
-            self.environment_processor = process_mnht_mnls_environment
-        except ImportError:
-            print("⚠️ Environment detection not available")
-            self.environment_processor = None
-        
-        # Fallback customer mappings (only used if Excel system fails)
-        self.fallback_customer_email_to_category = {
-            'amd.com': 'MNHT',
-            'novartis.com': 'MNLS',
-            'wdc.com': 'MNHT',
-            'abbott.com': 'MNHT',
-            'abbvie.com': 'MNLS',
-            'amgen.com': 'MNLS'
+    # Fixed attribute set - instances carry no per-object __dict__
+    __slots__ = (
+        'mapping_manager', 'ticket_config', 'customer_role_manager',
+        'environment_processor', 'fallback_customer_email_to_category',
+        '_keyword_index', '_required_fields_by_cat', '_populated_fields_by_cat',
+        '_display_spec_by_cat', '_match_keyword', '_min_keyword_len', '_mapping_cache', '_mapping_stamp'
+    )
+    
+    # Ticket mapping and the lookups derived from it, shared by every instance
+    _shared_config = None
+    
+    # (organization, limit) -> (fetched at, tickets), shared because callers create short-lived instances
+    _recent_tickets_cache = {}
+    
+    @classmethod
+    def _load_config(cls) -> Dict:
+        """Load the ticket mapping once per process (rebuilt only if the mapping is reloaded)"""
+        from ticket_mapping_manager import get_ticket_mapping_manager
+        ticket_mapping_manager = get_ticket_mapping_manager()
+        ticket_config = ticket_mapping_manager.get_mapping()
+        if cls._shared_config is not None and cls._shared_config['ticket_config'] is ticket_config:
+            return cls._shared_config
+        
+        # Precompute category lookups once - the mapping does not change after load
+        categories = ticket_config.get('ticket_categories', {})
+        # (lowercased keyword, keyword, category), longest keyword first so the first hit is the most specific
+        keyword_index = tuple(sorted(
+            ((keyword.lower(), keyword, category)
+             for category, config in categories.items()
+             for keyword in config.get('keywords', [])),
+            key=lambda entry: -len(entry[1])
+        ))
+        cls._shared_config = {
+            'mapping_manager': ticket_mapping_manager,
+            'ticket_config': ticket_config,
+            'keyword_index': keyword_index,
+            # Queries shorter than the shortest keyword cannot match any keyword
+            'min_keyword_len': min((len(entry[0]) for entry in keyword_index), default=0),
+            # Memoized keyword scan - repeated queries (retries, reruns) become a dict hit
+            'match_keyword': lru_cache(maxsize=1024)(_build_keyword_matcher(keyword_index)),
+            'required_fields_by_cat': {category: config.get('required_fields', {}) for category, config in categories.items()},
+            'populated_fields_by_cat': {category: config.get('populated_fields', {}) for category, config in categories.items()},
+            # (field, label) pairs for create_ticket's summary: provided fields, then auto-populated ones
+            'display_spec_by_cat': {
+                category: (
+                    tuple((field, field_label(field)) for field in config.get('required_fields', {}) if field not in _META_FIELDS),
+                    tuple((field, field_label(field)) for field in config.get('populated_fields', {})),
+                )
+                for category, config in categories.items()
+            },
         }
         
-        print(f"✅ TicketCreator initialized - {self.mapping_manager.get_source_info()}")
-        
         # Check if MNHT/MNLS have updated field configurations
-        categories = self.ticket_config.get('ticket_categories', {})
         for category in ['MNHT', 'MNLS']:
             if category in categories:
                 required_fields = list(categories[category].get('required_fields', {}).keys())
@@ -54,17 +332,53 @@ class TicketCreator:
                 populated_fields = categories[category].get('populated_fields', {})
                 if 'area' in populated_fields:
                     print(f"🎯 {category} area auto-populated: {populated_fields['area']}")
+        
+        return cls._shared_config
+    
+    def __init__(self):
+        # Load ticket configuration from Excel (with JSON fallback) - cached across instances
+        shared = TicketCreator._load_config()
+        self.mapping_manager = shared['mapping_manager']
+        self.ticket_config = shared['ticket_config']
+        self._keyword_index = shared['keyword_index']
+        self._match_keyword = shared['match_keyword']
+        self._min_keyword_len = shared['min_keyword_len']
+        self._required_fields_by_cat = shared['required_fields_by_cat']
+        self._populated_fields_by_cat = shared['populated_fields_by_cat']
+        self._display_spec_by_cat = shared['display_spec_by_cat']
+        
+        # Dynamic customer role manager - the process-wide instance, so the Excel
+        # sheet is loaded once (on first TicketCreator) rather than per creator
+        from customer_role_manager import customer_role_manager
+        self.customer_role_manager = customer_role_manager
+        # Customer mapping per email domain, cleared whenever the Excel file is reloaded
+        self._mapping_cache: Dict[str, Dict] = {}
+        self._mapping_stamp = customer_role_manager.file_last_modified
+        
+        # Import environment detection utility
+        try:
+            from environment_detection import process_mnht_mnls_environment
+            self.environment_processor = process_mnht_mnls_environment
+        except ImportError:
+            print("⚠️ Environment detection not available")
+            self.environment_processor = None
+        
+        # Fallback customer mappings (only used if Excel system fails)
+        self.fallback_customer_email_to_category = _FALLBACK_EMAIL_TO_CATEGORY
+        
+        if DEBUG_LOGGING:
+            print(f"✅ TicketCreator initialized - {self.mapping_manager.get_source_info()}")
     
     
     def create_ticket(self, query: str, customer_email: str = None) -> Dict:
         """
         Create a ticket based on query and customer information
         """
-        print(f"\n🎫 TICKET CREATION INITIATED")
-        print("=" * 50)
+        print(f"\n🎫 TICKET CREATION INITIATED\n{_EQ50}")
         
         # Check organization access control first
         if customer_email:
+            from organization_access_controller import check_organization_access
             access_check = check_organization_access(query, customer_email)
             if not access_check['allowed']:
                 print(f"🚫 Access denied: {access_check['message']}")
@@ -76,20 +390,8 @@ class TicketCreator:
                     'user_organization': access_check['user_org']
                 }
         
-        # Extract customer domain if email provided
-        customer = "UNKNOWN"
-        if customer_email:
-            domain = customer_email.split('@')[-1].lower()
-            # Map specific domains to customer names
-            domain_to_customer = {
-                'amd.com': 'AMD',
-                'novartis.com': 'Novartis',  
-                'wdc.com': 'Wdc',
-                'abbott.com': 'Abbott',
-                'abbvie.com': 'Abbvie',
-                'amgen.com': 'Amgen'
-            }
-            customer = domain_to_customer.get(domain, domain.split('.')[0].capitalize())
+        # Extract customer name from email domain
+        customer = self._customer_from_email(customer_email)
         
         # Determine ticket category
         category = self.determine_ticket_category(query, customer, customer_email)
@@ -100,209 +402,107 @@ class TicketCreator:
         ticket_data = self.collect_user_input_for_category(category, query, customer, customer_email)
         
         # Generate ticket ID
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # One clock read per ticket so the id, created date and filename agree
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         ticket_id = f"TICKET_{category}_{customer}_{timestamp}"
         ticket_data['ticket_id'] = ticket_id
         ticket_data['category'] = category
         ticket_data['customer'] = customer
-        ticket_data['created_date'] = datetime.now().isoformat()
+        ticket_data['created_date'] = now.isoformat()
         ticket_data['customer_email'] = customer_email
         ticket_data['original_query'] = query
         
         # Add auto-populated fields
-        auto_fields = self.get_populated_fields_for_category(category)
-        for field, value in auto_fields.items():
-            if field not in ticket_data:
-                # Resolve dynamic values
-                if isinstance(value, str):
-                    if 'based on description' in value.lower():
-                        ticket_data[field] = f"Support Request: {query[:80]}{'...' if len(query) > 80 else ''}"
-                    elif 'based on user domain' in value.lower():
-                        domain = customer_email.split('@')[-1].lower() if customer_email and '@' in customer_email else 'unknown.com'
-                        ticket_data[field] = domain.replace('.com', '')
-                    elif 'based on customer organization' in value.lower():
-                        # Get the actual organization name from customer role manager
-                        customer_mapping = self.customer_role_manager.get_customer_mapping(customer_email.split('@')[-1] if customer_email and '@' in customer_email else 'unknown.com')
-                        ticket_data[field] = customer_mapping.get('organization', customer)
-                    elif 'based on customer sheet mapping' in value.lower():
-                        # Determine MNHT or MNLS based on customer sheet mapping
-                        customer_mapping = self.customer_role_manager.get_customer_mapping(customer_email.split('@')[-1] if customer_email and '@' in customer_email else 'unknown.com')
-                        sheet = customer_mapping.get('sheet', 'HT')
-                        if sheet.upper() == 'LS':
-                            ticket_data[field] = 'MNLS'
-                        else:  # Default to HT/MNHT
-                            ticket_data[field] = 'MNHT'
-                    else:
-                        ticket_data[field] = value
-                else:
-                    ticket_data[field] = value
-        
-        # Save ticket to file
-        output_dir = "ticket_simulation_output"
-        os.makedirs(output_dir, exist_ok=True)
-        filename = f"ticket_demo_{category}_{customer}_{timestamp}.txt"
-        filepath = os.path.join(output_dir, filename)
-        
-        with open(filepath, 'w') as f:
-            f.write(f"TICKET SIMULATION OUTPUT\n")
-            f.write(f"========================\n\n")
-            f.write(f"Ticket ID: {ticket_data['ticket_id']}\n")
-            f.write(f"Category: {ticket_data['category']}\n")
-            f.write(f"Customer: {ticket_data['customer']}\n")
-            f.write(f"Created: {ticket_data['created_date']}\n")
-            f.write(f"Customer Email: {ticket_data['customer_email']}\n")
-            f.write(f"Original Query: {ticket_data['original_query']}\n\n")
-            
-            f.write("TICKET DETAILS:\n")
-            f.write("===============\n")
-            for key, value in ticket_data.items():
-                if key not in ['ticket_id', 'category', 'customer', 'created_date', 'customer_email', 'original_query']:
-                    f.write(f"{key.replace('_', ' ').title()}: {value}\n")
+        self._auto_populate(category, ticket_data, query, customer, customer_email, now)
+        
+        # Save ticket to file - always the base simulation layout (subclasses override
+        # save_ticket_to_file with their own file formats)
+        self._write_ticket_file(ticket_data, timestamp, self._render_ticket_text(ticket_data))
         
         # Display comprehensive ticket details
         print(f"\n✅ Ticket simulation completed!")
         print(f"🎫 Ticket ID: {ticket_data['ticket_id']}")
         print(f"📂 Category: {ticket_data['category']}")
         print(f"👤 Customer: {ticket_data['customer']}")
-        print(f"📄 Document saved: {filepath}")
         
         # Display all ticket fields
-        print(f"\n📋 COMPLETE TICKET DETAILS:")
-        print("=" * 50)
+        # Build the whole details block, then print it once
+        lines = ["\n📋 COMPLETE TICKET DETAILS:", _EQ50]
         
-        # Exclude metadata fields from display
-        excluded_fields = {
-            'category', 'ticket_id', 'created_date', 'customer_email', 
-            'customer', 'original_query'
-        }
+        # Field labels are precomputed per category - render only the fields the ticket has
+        provided_spec, auto_spec = self._display_spec_by_cat.get(ticket_data['category'], ((), ()))
+        provided_lines = [f"   • {label}: {ticket_data[field]}" for field, label in provided_spec if field in ticket_data]
+        auto_lines = [f"   • {label}: {ticket_data[field]}" for field, label in auto_spec if field in ticket_data]
         
-        # Show user-provided fields
-        print("🔹 PROVIDED FIELDS:")
-        user_fields_shown = False
-        required_fields = self.get_required_fields_for_category(ticket_data['category'])
-        for field, value in ticket_data.items():
-            if field not in excluded_fields and field in required_fields.keys():
-                field_name = field.replace('_', ' ').title()
-                print(f"   • {field_name}: {value}")
-                user_fields_shown = True
-        
-        if not user_fields_shown:
-            print("   • Description: " + ticket_data.get('description', 'N/A'))
-        
-        # Show auto-populated fields
-        print("\n🤖 AUTO-POPULATED FIELDS:")
-        auto_fields = self.get_populated_fields_for_category(ticket_data['category'])
-        for field in auto_fields.keys():
-            if field in ticket_data:
-                field_name = field.replace('_', ' ').title()
-                print(f"   • {field_name}: {ticket_data[field]}")
-        
-        print("=" * 50)
+        lines.append("🔹 PROVIDED FIELDS:")
+        lines.extend(provided_lines or ["   • Description: " + ticket_data.get('description', 'N/A')])
+        lines.append("\n🤖 AUTO-POPULATED FIELDS:")
+        lines.extend(auto_lines)
+        lines.append(_EQ50)
+        print("\n".join(lines))
         
         return ticket_data
     
-    def create_ticket_streamlit(self, query: str, customer_email: str = None, form_data: Dict = None) -> Dict:
-        """
-        Create a ticket using Streamlit form data (non-interactive)
-        
-        Args:
-            query: Original user query
-            customer_email: Customer email address
-            form_data: Dictionary containing form data from Streamlit
-            
-        Returns:
-            Dictionary containing ticket information
-        """
-        print(f"\n🎫 STREAMLIT TICKET CREATION")
-        print("=" * 50)
-        
-        # Check organization access control first
-        if customer_email:
-            access_check = check_organization_access(query, customer_email)
-            if not access_check['allowed']:
-                print(f"🚫 Access denied: {access_check['message']}")
-                print(f"   Blocked organizations: {access_check['blocked_orgs']}")
-                return {
-                    'status': 'access_denied',
-                    'message': access_check['message'],
-                    'blocked_organizations': access_check['blocked_orgs'],
-                    'user_organization': access_check['user_org']
-                }
-        
-        # Extract customer domain if email provided
-        customer = "UNKNOWN"
-        if customer_email:
-            domain = customer_email.split('@')[-1].lower()
-            # Map specific domains to customer names
-            domain_to_customer = {
-                'amd.com': 'AMD',
-                'novartis.com': 'Novartis',  
-                'wdc.com': 'Wdc',
-                'abbott.com': 'Abbott',
-                'abbvie.com': 'Abbvie'
-            }
-            customer = domain_to_customer.get(domain, domain.split('.')[0].capitalize())
-        
-        # Determine ticket category
-        category = self.determine_ticket_category(query, customer, customer_email)
-        
-        print(f"🏷️  Category: {category}")
-        print(f"👤 Customer: {customer}")
-        
-        # Create base ticket data
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        ticket_id = f"TICKET_{category}_{customer}_{timestamp}"
-        
-        ticket_data = {
-            'ticket_id': ticket_id,
-            'category': category,
-            'customer': customer,
-            'customer_email': customer_email,
-            'created_date': datetime.now().isoformat(),
-            'original_query': query
-        }
-        
-        # Add form data if provided
-        if form_data:
-            ticket_data.update(form_data)
-        
-        # Auto-populate fields based on category
-        populated_fields = self.get_populated_fields_for_category(category)
-        for field, value in populated_fields.items():
-            if field not in ticket_data:  # Don't override form data
-                # Resolve dynamic values
-                if isinstance(value, str):
-                    if value.lower() == 'current_date':
-                        # Replace with current date in YYYY-MM-DD format
-                        ticket_data[field] = datetime.now().strftime('%Y-%m-%d')
-                    elif 'based on description' in value.lower():
-                        ticket_data[field] = f"Support Request: {query[:80]}{'...' if len(query) > 80 else ''}"
-                    elif 'based on user domain' in value.lower():
-                        domain = customer_email.split('@')[-1].lower() if customer_email and '@' in customer_email else 'unknown.com'
-                        ticket_data[field] = domain.replace('.com', '')
-                    elif 'based on customer organization' in value.lower():
-                        # Get the actual organization name from customer role manager
-                        customer_mapping = self.customer_role_manager.get_customer_mapping(customer_email.split('@')[-1] if customer_email and '@' in customer_email else 'unknown.com')
-                        ticket_data[field] = customer_mapping.get('organization', customer)
-                    elif 'based on customer sheet mapping' in value.lower():
-                        # Determine MNHT or MNLS based on customer sheet mapping
-                        customer_mapping = self.customer_role_manager.get_customer_mapping(customer_email.split('@')[-1] if customer_email and '@' in customer_email else 'unknown.com')
-                        sheet = customer_mapping.get('sheet', 'HT')
-                        if sheet.upper() == 'LS':
-                            ticket_data[field] = 'MNLS'
-                        else:  # Default to HT/MNHT
-                            ticket_data[field] = 'MNHT'
-                    else:
-                        ticket_data[field] = value
-                else:
-                    ticket_data[field] = value
-        
-        # Save ticket to file
-        self.save_ticket_to_file(ticket_data)
-        
-        print(f"✅ Streamlit ticket created successfully: {ticket_id}")
-        
-        return ticket_data
+    @classmethod
+    def _ticket_output_dir(cls) -> str:
+        """Simulation output directory, created on first use only"""
+        return ensure_output_dir(TICKET_OUTPUT_DIR)
+    
+    def _customer_from_email(self, customer_email: str) -> str:
+        """Map an email domain to its customer name (UNKNOWN without an email)"""
+        if not customer_email:
+            return "UNKNOWN"
+        return customer_name_for_domain(_domain_of(customer_email))
+    
+    def _get_mapping_cached(self, domain: str) -> Dict:
+        """Customer mapping for a domain, looked up once until the Excel file changes"""
+        manager = self.customer_role_manager
+        manager.refresh_if_needed()
+        # The manager is shared, so another caller may have triggered the reload
+        if manager.file_last_modified != self._mapping_stamp:
+            self._mapping_cache.clear()
+            self._mapping_stamp = manager.file_last_modified
+        mapping = self._mapping_cache.get(domain)
+        if mapping is None:
+            mapping = manager.get_customer_mapping(domain)
+            self._mapping_cache[domain] = mapping
+        return mapping
+    
+    def _auto_populate(self, category: str, ticket_data: Dict, query: str, customer: str, customer_email: str,
+                       now: Optional[datetime] = None):
+        """Fill the category's populated fields into ticket_data, keeping any value already set"""
+        # Parse the email domain and format the ticket's date once for every dynamic field
+        domain = _domain_of(customer_email)
+        today = (now or datetime.now()).strftime('%Y-%m-%d')
+        for field, value in self.get_populated_fields_for_category(category).items():
+            if field not in ticket_data:
+                ticket_data[field] = self._resolve_auto_value(value, query, customer, domain, today)
+    
+    def _resolve_auto_value(self, value, query: str, customer: str, domain: str, today: str):
+        """Resolve a populated-field value from the mapping, filling in dynamic placeholders"""
+        handler = _dynamic_handler(value) if isinstance(value, str) else None
+        if handler is None:
+            return value
+        return getattr(self, handler)(query, customer, domain, today)
+    
+    def _auto_summary(self, query: str, customer: str, domain: str, today: str) -> str:
+        return support_summary(query)
+    
+    def _auto_domain(self, query: str, customer: str, domain: str, today: str) -> str:
+        return domain.replace('.com', '')
+    
+    def _auto_organization(self, query: str, customer: str, domain: str, today: str) -> str:
+        # Actual organization name from the customer role manager
+        return self._get_mapping_cached(domain).get('organization', customer)
+    
+    def _auto_sheet_category(self, query: str, customer: str, domain: str, today: str) -> str:
+        # MNLS for customers on the LS sheet, MNHT (default) otherwise
+        sheet = self._get_mapping_cached(domain).get('sheet', 'HT')
+        return 'MNLS' if sheet.upper() == 'LS' else 'MNHT'
+    
+    def _auto_current_date(self, query: str, customer: str, domain: str, today: str) -> str:
+        return today
     
     def get_category_from_email(self, customer_email: str) -> str:
         """
@@ -319,10 +519,10 @@ class TicketCreator:
         
         try:
             # Extract domain from email
-            domain = customer_email.split('@')[-1].lower()
+            domain = _domain_of(customer_email)
             
             # Get customer mapping from Excel-based system
-            customer_mapping = self.customer_role_manager.get_customer_mapping(domain)
+            customer_mapping = self._get_mapping_cached(domain)
             
             if customer_mapping and 'sheet' in customer_mapping:
                 sheet_name = customer_mapping['sheet'].upper()
@@ -330,11 +530,13 @@ class TicketCreator:
                 # Map sheet name to ticket category
                 if sheet_name == 'LS':
                     category = 'MNLS'
-                    print(f"🧬 Excel sheet mapping: {customer_mapping.get('organization', 'Unknown')} ({domain}) → Sheet: LS → Category: MNLS")
+                    if DEBUG_LOGGING:
+                        print(f"🧬 Excel sheet mapping: {customer_mapping.get('organization', 'Unknown')} ({domain}) → Sheet: LS → Category: MNLS")
                     return category
                 elif sheet_name == 'HT':
                     category = 'MNHT'  
-                    print(f"💻 Excel sheet mapping: {customer_mapping.get('organization', 'Unknown')} ({domain}) → Sheet: HT → Category: MNHT")
+                    if DEBUG_LOGGING:
+                        print(f"💻 Excel sheet mapping: {customer_mapping.get('organization', 'Unknown')} ({domain}) → Sheet: HT → Category: MNHT")
                     return category
                 else:
                     print(f"⚠️  Unknown sheet '{sheet_name}' for {domain}, using default category")
@@ -342,10 +544,12 @@ class TicketCreator:
             # Fallback to hardcoded mappings if Excel system doesn't have the customer
             if domain in self.fallback_customer_email_to_category:
                 category = self.fallback_customer_email_to_category[domain]
-                print(f"🔄 Fallback mapping: {domain} → Category: {category}")
+                if DEBUG_LOGGING:
+                    print(f"🔄 Fallback mapping: {domain} → Category: {category}")
                 return category
             
-            print(f"⚠️  No mapping found for {domain}, using default category")
+            if DEBUG_LOGGING:
+                print(f"⚠️  No mapping found for {domain}, using default category")
             return self.ticket_config.get("default_category", "MNHT")
             
         except Exception as e:
@@ -364,19 +568,11 @@ class TicketCreator:
         query_lower = query.lower()
         
         # 1. First priority: Keyword matching in query content
-        matches = []
-        for category, config in self.ticket_config["ticket_categories"].items():
-            keywords = config.get("keywords", [])
-            for keyword in keywords:
-                if keyword.lower() in query_lower:
-                    matches.append((len(keyword), keyword, category))
-        
-        # If keyword matches found, return the category of the longest (most specific) keyword
-        if matches:
-            matches.sort(key=lambda x: x[0], reverse=True)
-            longest_keyword = matches[0][1]
-            category = matches[0][2]
-            print(f"🎯 Keyword match: '{longest_keyword}' found in query → Category: {category}")
+        keyword_match = self._match_keyword(query_lower) if len(query_lower) >= self._min_keyword_len else None
+        if keyword_match:
+            keyword, category = keyword_match
+            if DEBUG_LOGGING:
+                print(f"🎯 Keyword match: '{keyword}' found in query → Category: {category}")
             return category
         
         # 2. Second priority: Excel-based customer email domain mapping
@@ -386,23 +582,16 @@ class TicketCreator:
                 return category
         
         # 3. Third priority: Hardcoded customer name fallback mapping
-        customer_to_category = {
-            'AMD': 'MNHT',
-            'NOVARTIS': 'MNLS', 
-            'WDC': 'MNHT',
-            'ABBOTT': 'MNHT',
-            'ABBVIE': 'MNLS',
-            'AMGEN': 'MNLS'
-        }
-        
-        if customer.upper() in customer_to_category:
-            category = customer_to_category[customer.upper()]
-            print(f"🏢 Customer name fallback: {customer} → Category: {category}")
+        if customer.upper() in _CUSTOMER_TO_CATEGORY:
+            category = _CUSTOMER_TO_CATEGORY[customer.upper()]
+            if DEBUG_LOGGING:
+                print(f"🏢 Customer name fallback: {customer} → Category: {category}")
             return category
         
         # 4. Final fallback: Default category
         default_category = self.ticket_config.get("default_category", "MNHT")
-        print(f"⚠️ Using default category: {default_category}")
+        if DEBUG_LOGGING:
+            print(f"⚠️ Using default category: {default_category}")
         return default_category
     
     def process_environment_field(self, query: str, category: str, user_response: str = None) -> Dict:
@@ -441,27 +630,21 @@ class TicketCreator:
 
     def get_required_fields_for_category(self, category: str) -> Dict:
         """Get required fields for a specific category"""
-        categories = self.ticket_config.get("ticket_categories", {})
-        if category in categories:
-            return categories[category].get("required_fields", {})
-        return {}
+        return self._required_fields_by_cat.get(category, {})
     
     def get_populated_fields_for_category(self, category: str) -> Dict:
         """Get auto-populated fields for a specific category"""
-        categories = self.ticket_config.get("ticket_categories", {})
-        if category in categories:
-            return categories[category].get("populated_fields", {})
-        return {}
+        return self._populated_fields_by_cat.get(category, {})
     
     def collect_user_input_for_category(self, category: str, query: str, customer: str, customer_email: str) -> Dict:
         """
         Collect user input for required fields based on category with smart auto-detection
         """
+        _require_tty('collect_user_input_for_category')
         ticket_data = {}
         required_fields = self.get_required_fields_for_category(category)
         
-        print(f"\n📝 Collecting information for {category} ticket:")
-        print("-" * 40)
+        print(f"\n📝 Collecting information for {category} ticket:\n{_DASH40}")
         
         for field_name, field_description in required_fields.items():
             # Check if description already contains "(Optional)"
@@ -474,7 +657,7 @@ class TicketCreator:
             if field_name == 'description':
                 # For description field, suggest using the original query
                 suggested_value = query
-                user_input = input(f"{prompt}(Press Enter to use: '{suggested_value}') ").strip()
+                user_input = _ask(f"{prompt}(Press Enter to use: '{suggested_value}') ")
                 if not user_input:
                     user_input = suggested_value
                 ticket_data[field_name] = user_input
@@ -487,12 +670,12 @@ class TicketCreator:
                     # Environment was auto-detected or previously provided
                     if env_result.get('auto_detected'):
                         print(f"🎯 Auto-detected environment: {env_result['environment']} (confidence: {env_result['confidence']:.1%})")
-                        confirm = input(f"Use auto-detected environment '{env_result['environment']}'? (Y/n): ").strip().lower()
+                        confirm = _ask(f"Use auto-detected environment '{env_result['environment']}'? (Y/n): ").lower()
                         if confirm in ['', 'y', 'yes']:
                             ticket_data[field_name] = env_result['environment']
                         else:
                             # User wants to specify manually
-                            user_input = input("Which environment is affected? (production/staging): ").strip()
+                            user_input = _ask("Which environment is affected? (production/staging): ")
                             validated_env = self.validate_environment_input(user_input)
                             if validated_env:
                                 ticket_data[field_name] = validated_env
@@ -504,19 +687,19 @@ class TicketCreator:
                         ticket_data[field_name] = env_result['environment']
                 elif env_result.get('needs_question'):
                     # Need to ask user for environment
-                    user_input = input(f"{env_result.get('question', prompt)}: ").strip()
+                    user_input = _ask(f"{env_result.get('question', prompt)}: ")
                     validated_env = self.validate_environment_input(user_input)
                     if validated_env:
                         ticket_data[field_name] = validated_env
                     else:
                         # Keep asking until valid
                         while not validated_env:
-                            user_input = input("⚠️ Please specify 'production' or 'staging': ").strip()
+                            user_input = _ask("⚠️ Please specify 'production' or 'staging': ")
                             validated_env = self.validate_environment_input(user_input)
                         ticket_data[field_name] = validated_env
                 else:
                     # Fallback to manual input
-                    user_input = input(prompt).strip()
+                    user_input = _ask(prompt)
                     if user_input:
                         ticket_data[field_name] = user_input
                     else:
@@ -525,15 +708,14 @@ class TicketCreator:
             elif field_name == 'affected_version':
                 # Auto-populate affected_version with customer's product version from Excel
                 if customer_email:
-                    domain = customer_email.split('@')[-1].lower()
-                    customer_mapping = self.customer_role_manager.get_customer_mapping(domain)
+                    customer_mapping = self._get_mapping_cached(_domain_of(customer_email))
                     prod_version = customer_mapping.get('prod_version', 'Unknown')
                     
                     print(f"🎯 Auto-populated affected version: {prod_version} (from customer Excel data)")
                     ticket_data[field_name] = prod_version
                 else:
                     # Fallback if no customer email
-                    user_input = input(prompt).strip()
+                    user_input = _ask(prompt)
                     if user_input:
                         ticket_data[field_name] = user_input
                     else:
@@ -541,14 +723,14 @@ class TicketCreator:
                         
             else:
                 # Standard field handling
-                user_input = input(prompt).strip()
+                user_input = _ask(prompt)
                 
                 if user_input:
                     ticket_data[field_name] = user_input
                 elif "(Optional)" not in field_description:
                     # For required fields, keep asking until we get input
                     while not user_input:
-                        user_input = input(f"⚠️  {field_name} is required. {prompt}").strip()
+                        user_input = _ask(f"⚠️  {field_name} is required. {prompt}")
                     ticket_data[field_name] = user_input
         
         return ticket_data
@@ -566,113 +748,8 @@ class TicketCreator:
         if not user_input:
             return None
             
-        user_input = user_input.lower().strip()
-        
-        # Production variations
-        if user_input in ['production', 'prod', 'live', 'p', '1']:
-            return 'production'
-        
-        # Staging variations  
-        if user_input in ['staging', 'stage', 'test', 'dev', 'development', 's', '2']:
-            return 'staging'
-        
-        return None
+        return _ENVIRONMENT_ALIASES.get(user_input.lower().strip())
     
-    def create_ticket_streamlit(self, query: str, customer_email: str = None, ticket_data: dict = None) -> Dict:
-        """
-        Create a ticket for Streamlit interface with pre-filled data
-        
-        Args:
-            query: Original user query
-            customer_email: Customer email address
-            ticket_data: Pre-filled ticket data from the form
-            
-        Returns:
-            Dictionary containing ticket information
-        """
-        print(f"\n🎫 TICKET CREATION INITIATED (Streamlit)")
-        print("=" * 50)
-        
-        # Extract customer domain if email provided
-        customer = "UNKNOWN"
-        if customer_email:
-            domain = customer_email.split('@')[-1].lower()
-            # Map specific domains to customer names
-            domain_to_customer = {
-                'amd.com': 'AMD',
-                'novartis.com': 'Novartis',  
-                'wdc.com': 'Wdc',
-                'abbott.com': 'Abbott',
-                'abbvie.com': 'Abbvie'
-            }
-            customer = domain_to_customer.get(domain, domain.split('.')[0].capitalize())
-        
-        # Determine ticket category based on customer email domain
-        category = self.get_category_from_email(customer_email) if customer_email else 'MNHT'
-        
-        print(f"🏷️  Category: {category}")
-        print(f"👤 Customer: {customer}")
-        
-        # Generate unique ticket ID
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        ticket_id = f"TICKET_{category}_{customer}_{timestamp}"
-        
-        # Prepare final ticket data
-        final_ticket_data = {
-            'ticket_id': ticket_id,
-            'category': category,
-            'customer': customer,
-            'customer_email': customer_email,
-            'original_query': query,
-            'created_date': datetime.now().isoformat(),
-            **ticket_data  # Merge in the form data
-        }
-        
-        # Add auto-populated fields for the category
-        auto_fields = self.get_populated_fields_for_category(category)
-        for field, value in auto_fields.items():
-            if field not in final_ticket_data:
-                # Resolve dynamic values
-                if isinstance(value, str):
-                    if 'based on description' in value.lower():
-                        final_ticket_data[field] = f"Support Request: {query[:80]}{'...' if len(query) > 80 else ''}"
-                    elif 'based on user domain' in value.lower():
-                        domain = customer_email.split('@')[-1].lower() if customer_email and '@' in customer_email else 'unknown.com'
-                        final_ticket_data[field] = domain.replace('.com', '')
-                    elif 'based on customer organization' in value.lower():
-                        # Get the actual organization name from customer role manager
-                        customer_mapping = self.customer_role_manager.get_customer_mapping(customer_email.split('@')[-1] if customer_email and '@' in customer_email else 'unknown.com')
-                        final_ticket_data[field] = customer_mapping.get('organization', customer)
-                    elif 'based on customer sheet mapping' in value.lower():
-                        # Determine MNHT or MNLS based on customer sheet mapping
-                        customer_mapping = self.customer_role_manager.get_customer_mapping(customer_email.split('@')[-1] if customer_email and '@' in customer_email else 'unknown.com')
-                        sheet = customer_mapping.get('sheet', 'HT')
-                        if sheet.upper() == 'LS':
-                            final_ticket_data[field] = 'MNLS'
-                        else:  # Default to HT/MNHT
-                            final_ticket_data[field] = 'MNHT'
-                    else:
-                        final_ticket_data[field] = value
-                else:
-                    final_ticket_data[field] = value
-        
-        # Save ticket to file
-        os.makedirs('ticket_simulation_output', exist_ok=True)
-        filepath = os.path.join('ticket_simulation_output', f"{ticket_id}.txt")
-        
-        with open(filepath, 'w') as f:
-            f.write("SUPPORT TICKET SIMULATION\n")
-            f.write("=" * 50 + "\n\n")
-            
-            for key, value in final_ticket_data.items():
-                formatted_key = key.replace('_', ' ').title()
-                f.write(f"{formatted_key}: {value}\n")
-        
-        print(f"📄 Document saved: {filepath}")
-        print(f"✅ Ticket created successfully: {ticket_id}")
-        
-        return final_ticket_data
-
     def get_ticket_fields_from_user(self, query: str) -> Dict:
         """
         Collect ticket information from user input
@@ -683,71 +760,64 @@ class TicketCreator:
         Returns:
             Dictionary containing ticket field values
         """
-        print("\n" + "="*60)
-        print("🎫 NO RELEVANT INFORMATION FOUND")
-        print("Let's create a support ticket for your query.")
-        print("="*60)
-        print(f"Original Query: {query}")
-        print("-"*60)
+        _require_tty('get_ticket_fields_from_user')
+        ticket_data = {'original_query': query}
         
-        ticket_data = {
-            'original_query': query,
-            'description': f"User Query: {query}\n\nNo relevant information was found in the knowledge base. Please investigate and provide assistance."
-        }
-        
-        # Collect required fields
-        print("\n📝 Please provide the following information:")
+        # Description sections are collected as parts and joined once at the end
+        desc_parts = [
+            f"User Query: {query}",
+            "No relevant information was found in the knowledge base. Please investigate and provide assistance."
+        ]
         
         # Summary (auto-generated but can be modified)
-        suggested_summary = f"Support Request: {query[:100]}{'...' if len(query) > 100 else ''}"
-        print(f"\n1. Summary (suggested: {suggested_summary})")
-        summary = input("   Enter summary (or press Enter to use suggested): ").strip()
-        ticket_data['summary'] = summary if summary else suggested_summary
+        suggested_summary = support_summary(query, 100)
         
+        # Banner and required-field intro in one write
+        sys.stdout.write(TICKET_FIELDS_BANNER.format(query=query, suggested_summary=suggested_summary))
+        sys.stdout.flush()
+        ticket_data['summary'] = _ask("   Enter summary (or press Enter to use suggested): ", default=suggested_summary)
+        
+        # Each section heading goes out with its prompt in a single write
         # Priority
-        print("\n2. Priority")
-        print("   Options: Highest, High, Medium, Low, Lowest")
-        priority = input("   Enter priority [Medium]: ").strip()
-        ticket_data['priority'] = priority if priority else "Medium"
+        ticket_data['priority'] = _choice(
+            _ask("\n2. Priority\n   Options: Highest, High, Medium, Low, Lowest\n   Enter priority [Medium]: ", default="Medium"),
+            _PRIORITIES, "Medium"
+        )
         
         # Issue Type
-        print("\n3. Issue Type")
-        print("   Options: Task, Bug, Story, Epic, Support")
-        issue_type = input("   Enter issue type [Task]: ").strip()
-        ticket_data['issue_type'] = issue_type if issue_type else "Task"
+        ticket_data['issue_type'] = _choice(
+            _ask("\n3. Issue Type\n   Options: Task, Bug, Story, Epic, Support\n   Enter issue type [Task]: ", default="Task"),
+            _ISSUE_TYPES, "Task"
+        )
         
         # Project Key
-        print("\n4. Project Key")
-        project_key = input("   Enter project key (e.g., SUPPORT, HELP): ").strip()
-        while not project_key:
-            print("   Project key is required!")
-            project_key = input("   Enter project key: ").strip()
-        ticket_data['project_key'] = project_key.upper()
+        ticket_data['project_key'] = _ask_required(
+            "\n4. Project Key\n   Enter project key (e.g., SUPPORT, HELP): ",
+            retry_prompt="   Project key is required!\n   Enter project key: "
+        ).upper()
         
         # Optional fields
-        print("\n📋 Optional Information:")
-        
         # Assignee
-        assignee = input("   Assignee (email or username, optional): ").strip()
+        assignee = _ask("\n📋 Optional Information:\n   Assignee (email or username, optional): ")
         if assignee:
             ticket_data['assignee'] = assignee
         
         # Labels
-        labels = input("   Labels (comma-separated, optional): ").strip()
+        labels = _ask("   Labels (comma-separated, optional): ")
         if labels:
-            ticket_data['labels'] = [label.strip() for label in labels.split(',')]
+            ticket_data['labels'] = [part for part in _CSV_SPLIT.split(labels.strip(', ')) if part]
         
         # Components
-        components = input("   Components (comma-separated, optional): ").strip()
+        components = _ask("   Components (comma-separated, optional): ")
         if components:
-            ticket_data['components'] = [comp.strip() for comp in components.split(',')]
+            ticket_data['components'] = [part for part in _CSV_SPLIT.split(components.strip(', ')) if part]
         
         # Additional description
-        print("\n   Additional description (optional):")
-        additional_desc = input("   Enter any additional details: ").strip()
+        additional_desc = _ask("\n   Additional description (optional):\n   Enter any additional details: ")
         if additional_desc:
-            ticket_data['description'] += f"\n\nAdditional Details: {additional_desc}"
+            desc_parts.append(f"Additional Details: {additional_desc}")
         
+        ticket_data['description'] = "\n\n".join(desc_parts)
         return ticket_data
     
     def get_recent_tickets(self, organization: str, limit: int = 10) -> list:
@@ -761,6 +831,13 @@ class TicketCreator:
         Returns:
             List of recent tickets
         """
+        # Reuse a recent fetch for the same organization
+        cache_key = (organization, limit)
+        cached = TicketCreator._recent_tickets_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < RECENT_TICKETS_TTL:
+            # Fresh dicts per call - callers may modify them without touching the cache
+            return [dict(ticket) for ticket in cached[1]]
+        
         try:
             print(f"\n🔍 Searching recent tickets for organization: {organization}")
             
@@ -788,16 +865,45 @@ class TicketCreator:
                     }
                     transformed_tickets.append(transformed_ticket)
                 
-                return transformed_tickets
+                TicketCreator._recent_tickets_cache[cache_key] = (time.monotonic(), transformed_tickets)
+                return [dict(ticket) for ticket in transformed_tickets]
             else:
                 print(f"⚠️ No recent tickets found for organization: {organization}")
                 return []
                 
         except Exception as e:
             print(f"❌ Error getting recent tickets for {organization}: {e}")
-            import traceback
             traceback.print_exc()
             return []
+    
+    @classmethod
+    def invalidate_recent_tickets(cls, organization: str = None):
+        """Drop cached recent tickets for one organization (or all of them)"""
+        if organization is None:
+            cls._recent_tickets_cache.clear()
+            return
+        for cache_key in [key for key in cls._recent_tickets_cache if key[0] == organization]:
+            cls._recent_tickets_cache.pop(cache_key, None)
+    
+    def get_recent_tickets_bulk(self, organizations: list, limit: int = 10) -> Dict[str, list]:
+        """
+        Get recent tickets for several organizations, fetching from JIRA concurrently
+        
+        Args:
+            organizations: Organization names
+            limit: Number of recent tickets to return per organization
+            
+        Returns:
+            Dictionary of organization -> list of recent tickets (in the order given)
+        """
+        organizations = list(dict.fromkeys(organizations))
+        if not organizations:
+            return {}
+        
+        # Each lookup is a blocking JIRA round-trip, so overlap them
+        with ThreadPoolExecutor(max_workers=min(8, len(organizations))) as executor:
+            results = executor.map(lambda organization: self.get_recent_tickets(organization, limit), organizations)
+            return dict(zip(organizations, results))
 
     def create_jira_ticket(self, ticket_data: Dict) -> Optional[str]:
         """
@@ -811,26 +917,30 @@ class TicketCreator:
             Created ticket key or None if failed
         """
         try:
-            print("\n🚀 Creating JIRA ticket...")
-            print("-"*40)
+            print(f"\n🚀 Creating JIRA ticket...\n{_DASH40}")
             
             # This method is now called from the LangGraph node which handles MCP calls
             # For standalone usage, we'll simulate the response
-            ticket_key = f"{ticket_data['project_key']}-{hash(ticket_data['summary']) % 1000:03d}"
+            # Random 4-hex-digit suffix: no pass over the summary, 65536 slots instead of 1000
+            ticket_key = f"{ticket_data['project_key']}-{secrets.token_hex(2).upper()}"
             
-            print(f"✅ Ticket created successfully!")
-            print(f"🎫 Ticket Key: {ticket_key}")
-            print(f"📝 Summary: {ticket_data['summary']}")
-            print(f"🎯 Priority: {ticket_data['priority']}")
-            print(f"📊 Type: {ticket_data['issue_type']}")
+            # Build the confirmation block, then print it once
+            lines = [
+                "✅ Ticket created successfully!",
+                f"🎫 Ticket Key: {ticket_key}",
+                f"📝 Summary: {ticket_data['summary']}",
+                f"🎯 Priority: {ticket_data['priority']}",
+                f"📊 Type: {ticket_data['issue_type']}",
+            ]
             
             if 'assignee' in ticket_data:
-                print(f"👤 Assignee: {ticket_data['assignee']}")
+                lines.append(f"👤 Assignee: {ticket_data['assignee']}")
             
             if 'labels' in ticket_data:
-                print(f"🏷️  Labels: {', '.join(ticket_data['labels'])}")
+                lines.append(f"🏷️  Labels: {', '.join(ticket_data['labels'])}")
             
-            print(f"\n📋 Description:\n{ticket_data['description']}")
+            lines.append(f"\n📋 Description:\n{ticket_data['description']}")
+            print("\n".join(lines))
             
             return ticket_key
             
@@ -848,14 +958,11 @@ class TicketCreator:
         Returns:
             True if valid, False otherwise
         """
-        missing_fields = []
-        
-        for field in self.required_fields:
-            if field not in ticket_data or not ticket_data[field]:
-                missing_fields.append(field)
+        present = {field for field, value in ticket_data.items() if value}
+        missing_fields = _REQUIRED_FIELDS - present
         
         if missing_fields:
-            print(f"❌ Missing required fields: {', '.join(missing_fields)}")
+            print(f"❌ Missing required fields: {', '.join(sorted(missing_fields))}")
             return False
         
         return True
@@ -870,28 +977,24 @@ class TicketCreator:
         Returns:
             Formatted string representation of the ticket
         """
-        preview = f"""
-🎫 TICKET PREVIEW
-{"="*50}
-Summary: {ticket_data.get('summary', 'N/A')}
-Project: {ticket_data.get('project_key', 'N/A')}
-Type: {ticket_data.get('issue_type', 'N/A')}
-Priority: {ticket_data.get('priority', 'N/A')}
-"""
-        
-        if 'assignee' in ticket_data:
-            preview += f"Assignee: {ticket_data['assignee']}\n"
-        
-        if 'labels' in ticket_data:
-            preview += f"Labels: {', '.join(ticket_data['labels'])}\n"
-        
-        if 'components' in ticket_data:
-            preview += f"Components: {', '.join(ticket_data['components'])}\n"
+        g = ticket_data.get
         
-        preview += f"\nDescription:\n{ticket_data.get('description', 'N/A')}\n"
-        preview += "="*50
+        # Optional lines collapse to empty strings so the preview is one f-string
+        assignee_line = f"Assignee: {ticket_data['assignee']}\n" if 'assignee' in ticket_data else ""
+        labels_line = f"Labels: {', '.join(ticket_data['labels'])}\n" if 'labels' in ticket_data else ""
+        components_line = f"Components: {', '.join(ticket_data['components'])}\n" if 'components' in ticket_data else ""
         
-        return preview
+        return f"""
+🎫 TICKET PREVIEW
+{_EQ50}
+Summary: {g('summary', 'N/A')}
+Project: {g('project_key', 'N/A')}
+Type: {g('issue_type', 'N/A')}
+Priority: {g('priority', 'N/A')}
+{assignee_line}{labels_line}{components_line}
+Description:
+{g('description', 'N/A')}
+{_EQ50}"""
     
     def create_ticket_streamlit(self, query: str, customer_email: str = None, form_data: Dict = None) -> Dict:
         """
@@ -905,28 +1008,21 @@ Priority: {ticket_data.get('priority', 'N/A')}
         Returns:
             Dictionary containing ticket information
         """
-        print(f"\n🎫 STREAMLIT TICKET CREATION INITIATED")
-        print("=" * 50)
+        if DEBUG_LOGGING:
+            print(f"\n🎫 STREAMLIT TICKET CREATION INITIATED\n{_EQ50}")
         
-        # Extract customer domain if email provided
-        customer = "UNKNOWN"
-        if customer_email:
-            domain = customer_email.split('@')[-1].lower()
-            # Map specific domains to customer names
-            domain_to_customer = {
-                'amd.com': 'AMD',
-                'novartis.com': 'Novartis',  
-                'wdc.com': 'Wdc',
-                'abbott.com': 'Abbott',
-                'abbvie.com': 'Abbvie'
-            }
-            customer = domain_to_customer.get(domain, domain.split('.')[0].capitalize())
+        # Extract customer name from email domain
+        customer = self._customer_from_email(customer_email)
         
         # Determine category based on customer domain
         category = self.determine_ticket_category(query, customer, customer_email)
         
-        print(f"🏷️  Category: {category}")
-        print(f"👤 Customer: {customer}")
+        if DEBUG_LOGGING:
+            print(f"🏷️  Category: {category}\n👤 Customer: {customer}")
+        
+        # One clock read per ticket so the id, filename and created stamp agree
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         
         # Create base ticket data
         ticket_data = {
@@ -934,8 +1030,8 @@ Priority: {ticket_data.get('priority', 'N/A')}
             'customer': customer,
             'customer_email': customer_email or 'unknown@example.com',
             'original_query': query,
-            'created_date': datetime.now().strftime("%Y%m%d_%H%M%S"),
-            'ticket_id': f"TICKET_{category}_{customer}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            'created_date': timestamp,
+            'ticket_id': f"TICKET_{category}_{customer}_{timestamp}"
         }
         
         # Add form data if provided
@@ -954,95 +1050,88 @@ Priority: {ticket_data.get('priority', 'N/A')}
                     ticket_data[ticket_field] = form_data[streamlit_field]
         
         # Populate category-specific fields
-        auto_fields = self.get_populated_fields_for_category(category)
-        for field, default_value in auto_fields.items():
-            if field not in ticket_data:  # Only add if not already set
-                # Resolve dynamic values
-                if isinstance(default_value, str):
-                    if 'based on description' in default_value.lower():
-                        ticket_data[field] = f"Support Request: {query[:80]}{'...' if len(query) > 80 else ''}"
-                    elif 'based on user domain' in default_value.lower():
-                        domain = customer_email.split('@')[-1].lower() if customer_email and '@' in customer_email else 'unknown.com'
-                        ticket_data[field] = domain.replace('.com', '')
-                    elif 'based on customer organization' in default_value.lower():
-                        # Get the actual organization name from customer role manager
-                        customer_mapping = self.customer_role_manager.get_customer_mapping(customer_email.split('@')[-1] if customer_email and '@' in customer_email else 'unknown.com')
-                        ticket_data[field] = customer_mapping.get('organization', customer)
-                    elif 'based on customer sheet mapping' in default_value.lower():
-                        # Determine MNHT or MNLS based on customer sheet mapping
-                        customer_mapping = self.customer_role_manager.get_customer_mapping(customer_email.split('@')[-1] if customer_email and '@' in customer_email else 'unknown.com')
-                        sheet = customer_mapping.get('sheet', 'HT')
-                        if sheet.upper() == 'LS':
-                            ticket_data[field] = 'MNLS'
-                        else:  # Default to HT/MNHT
-                            ticket_data[field] = 'MNHT'
-                    else:
-                        ticket_data[field] = default_value
-                else:
-                    ticket_data[field] = default_value
+        self._auto_populate(category, ticket_data, query, customer, customer_email, now)
         
         # Generate summary if not provided
         if 'summary' not in ticket_data:
-            summary = f"Support Request: {query[:100]}{'...' if len(query) > 100 else ''}"
+            summary = support_summary(query, 100)
             ticket_data['summary'] = summary
         
         # Save ticket simulation to file
-        filename = f"ticket_demo_{category}_{customer}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        output_dir = os.path.join(os.path.dirname(__file__), 'ticket_simulation_output')
-        os.makedirs(output_dir, exist_ok=True)
-        filepath = os.path.join(output_dir, filename)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write("="*60 + "\n")
-            f.write("TICKET SIMULATION - STREAMLIT CREATED\n")
-            f.write("="*60 + "\n")
-            f.write(f"Ticket ID: {ticket_data['ticket_id']}\n")
-            f.write(f"Category: {ticket_data['category']}\n")
-            f.write(f"Customer: {ticket_data['customer']}\n")
-            f.write(f"Created: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Original Query: {ticket_data['original_query']}\n")
-            f.write("-"*60 + "\n")
-            f.write("TICKET FIELDS:\n")
-            f.write("-"*60 + "\n")
-            
-            # Write all ticket fields
-            for field, value in ticket_data.items():
-                if field not in ['ticket_id', 'category', 'customer', 'created_date', 'original_query']:
-                    field_name = field.replace('_', ' ').title()
-                    f.write(f"{field_name}: {value}\n")
-            
-            f.write("="*60 + "\n")
+        ticket_text = self._render_ticket_text(ticket_data, style='streamlit', created=now.strftime('%Y-%m-%d %H:%M:%S'))
+        filepath = self._write_ticket_file(ticket_data, timestamp, ticket_text)
         
         print(f"✅ Ticket created successfully: {ticket_data['ticket_id']}")
-        print(f"📂 Category: {ticket_data['category']}")
-        print(f"👤 Customer: {ticket_data['customer']}")
-        print(f"📄 Document saved: {filepath}")
+        if DEBUG_LOGGING:
+            print(f"📂 Category: {ticket_data['category']}\n👤 Customer: {ticket_data['customer']}\n📄 Document saved: {filepath}")
         
         return ticket_data
         
-    def save_ticket_to_file(self, ticket_data: Dict):
-        """Save ticket data to file"""
-        # Generate filename
-        filename = f"ticket_demo_{ticket_data['category']}_{ticket_data['customer']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        output_dir = os.path.join(os.path.dirname(__file__), 'ticket_simulation_output')
-        os.makedirs(output_dir, exist_ok=True)
-        filepath = os.path.join(output_dir, filename)
-        
-        # Write ticket data to file
-        with open(filepath, 'w') as f:
-            f.write(f"TICKET SIMULATION OUTPUT\n")
-            f.write(f"========================\n\n")
-            f.write(f"Ticket ID: {ticket_data['ticket_id']}\n")
-            f.write(f"Category: {ticket_data['category']}\n")
-            f.write(f"Customer: {ticket_data['customer']}\n")
-            f.write(f"Created: {ticket_data['created_date']}\n")
-            f.write(f"Customer Email: {ticket_data.get('customer_email', 'N/A')}\n")
-            f.write(f"Original Query: {ticket_data['original_query']}\n\n")
+    def save_ticket_to_file(self, ticket_data: Dict, timestamp: str = None) -> str:
+        """Save ticket data to file and return its path (timestamp: the ticket's %Y%m%d_%H%M%S stamp)"""
+        timestamp = timestamp or datetime.now().strftime('%Y%m%d_%H%M%S')
+        filepath = self._write_ticket_file(ticket_data, timestamp, self._render_ticket_text(ticket_data))
+        
+        print(f"📄 Document saved: {filepath}")
+        return filepath
+    
+    def _render_ticket_text(self, ticket_data: Dict, style: str = 'standard', created: str = None) -> str:
+        """Full text of a ticket simulation file - the 'standard' layout or the 'streamlit' one"""
+        header, meta_fields, footer = _TICKET_LAYOUTS[style]
+        header_values = {
+            'ticket_id': ticket_data['ticket_id'],
+            'category': ticket_data['category'],
+            'customer': ticket_data['customer'],
+            'created': created or ticket_data['created_date'],
+            'customer_email': ticket_data.get('customer_email', 'N/A'),
+            'original_query': ticket_data['original_query'],
+        }
+        # All remaining ticket fields
+        fields = "".join(f"{field_label(field)}: {value}\n" for field, value in ticket_data.items() if field not in meta_fields)
+        return header.format_map(header_values) + fields + footer
+    
+    def _write_ticket_file(self, ticket_data: Dict, timestamp: str, ticket_text: str) -> str:
+        """Write a rendered ticket to the simulation output directory and return its path"""
+        filename = f"ticket_demo_{ticket_data['category']}_{ticket_data['customer']}_{timestamp}.txt"
+        filepath = os.path.join(self._ticket_output_dir(), filename)
+        # Whole ticket is known up front - one text-mode write (platform-native newlines)
+        # to a temp file, then an atomic rename so readers (downloads) never see a
+        # partially written ticket (unique temp name, so tickets saved in the same
+        # second cannot collide)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filepath), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(ticket_text)
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        return filepath
+    
+    def save_tickets_bulk(self, tickets: list, batch_size: int = BULK_BATCH_SIZE) -> str:
+        """
+        Append many tickets to a single JSONL file (bulk replays/migrations)
+        
+        The per-ticket .txt files from save_ticket_to_file cost an open/write/close each;
+        here the file is opened once, each batch goes out in one write and fsync runs once.
+        
+        Args:
+            tickets: List of ticket dictionaries
+            batch_size: Tickets per write call
             
-            f.write("TICKET DETAILS:\n")
-            f.write("===============\n")
-            for key, value in ticket_data.items():
-                if key not in ['ticket_id', 'category', 'customer', 'created_date', 'customer_email', 'original_query']:
-                    f.write(f"{key.replace('_', ' ').title()}: {value}\n")
+        Returns:
+            Path of the JSONL file
+        """
+        filepath = os.path.join(self._ticket_output_dir(), BULK_TICKETS_FILE)
+        
+        with open(filepath, 'ab', buffering=0) as f:
+            fd = f.fileno()
+            for start in range(0, len(tickets), batch_size):
+                _write_buffers(fd, [_ticket_record(ticket) for ticket in tickets[start:start + batch_size]])
+            os.fsync(fd)
         
-        print(f"📄 Document saved: {filepath}")
\ No newline at end of file
+        print(f"📄 {len(tickets)} tickets appended to: {filepath}")
+        return filepath
\ No newline at end of file
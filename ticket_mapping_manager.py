@@ -4,22 +4,57 @@ Loads ticket mapping configuration from Excel sheet instead of hardcoded JSON.
 Falls back to JSON if Excel is not available.
 """
 
-import pandas as pd
+import openpyxl
 import json
 import os
+import tempfile
+from functools import lru_cache
 from typing import Dict, Any, List
 
+# Use orjson to parse the JSON fallback config when available (stdlib json otherwise)
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# Excel column -> populated field name
+FIELD_MAPPINGS = (
+    ('Project', 'project'),
+    ('Work_Type', 'work_type'),
+    ('Priority', 'priority'),
+    ('Request_Type', 'request_type'),
+    ('Urgency', 'urgency'),
+    ('Impact', 'impact'),
+    ('Cloud_Operations_Request_Type', 'cloud_operations_request_type'),
+    ('Cloud_Environmental_List', 'cloud_environmental_list'),
+    ('Support_Org', 'support_org'),
+    ('JSD_Suppress_Group_Email_Notification', 'jsd_suppress_group_email_notification'),
+)
+
+# Columns the TicketMapping sheet must have; the others are optional
+REQUIRED_COLUMNS = frozenset({'Category', 'Keywords', 'Required_Fields'})
+
+# Values of the Active column that disable a category
+INACTIVE_VALUES = frozenset({'no', 'false'})
+
+# Version of the cached Excel parse - bump whenever the parsed shape or the column
+# validation changes, so caches written by older code are re-parsed instead of reused
+_CACHE_VERSION = 2
+
 class TicketMappingManager:
-    def __init__(self, excel_file_path: str = None, json_file_path: str = None):
+    def __init__(self, excel_file_path: str = None, json_file_path: str = None, cache_file_path: str = None):
         """
         Initialize the ticket mapping manager
         
         Args:
             excel_file_path: Path to the Excel file containing TicketMapping sheet
             json_file_path: Path to the fallback JSON configuration file
+            cache_file_path: Path to the cached parse of the Excel sheet
         """
         self.excel_file_path = excel_file_path or 'LS-HT Customer Info.xlsx'
         self.json_file_path = json_file_path or 'ticket_mapping_config.json'
+        self.cache_file_path = cache_file_path or 'ticket_mapping_config.cache.json'
         self.ticket_mapping = {}
         self.last_loaded_source = None
         
@@ -29,8 +64,10 @@ class TicketMappingManager:
     def _load_mapping(self):
         """Load ticket mapping from Excel first, fallback to JSON if needed"""
         try:
-            # Try to load from Excel first
-            self._load_from_excel()
+            # Try to load from Excel first - reuse the cached parse while the workbook is unchanged
+            if not self._load_from_cache():
+                self._load_from_excel()
+                self._save_cache()
             self.last_loaded_source = "Excel"
             print(f"✅ Loaded ticket mapping from Excel: {len(self.ticket_mapping.get('ticket_categories', {}))} categories")
         except Exception as excel_error:
@@ -50,34 +87,57 @@ class TicketMappingManager:
         if not os.path.exists(self.excel_file_path):
             raise FileNotFoundError(f"Excel file not found: {self.excel_file_path}")
         
-        # Use context manager to ensure file is properly closed
+        # Stream the sheet's raw cell values (read-only mode) and close the file after reading
         try:
-            # Read the TicketMapping sheet with explicit engine and close after reading
-            with pd.ExcelFile(self.excel_file_path, engine='openpyxl') as excel_file:
-                df = pd.read_excel(excel_file, sheet_name='TicketMapping')
+            workbook = openpyxl.load_workbook(self.excel_file_path, read_only=True, data_only=True)
+            try:
+                rows = workbook['TicketMapping'].iter_rows(values_only=True)
+                header = next(rows, ())
+                rows = list(rows)
+            finally:
+                workbook.close()
         except Exception as e:
             raise Exception(f"Failed to read TicketMapping sheet: {e}")
         
+        # Header name -> column position; validate the header once instead of defaulting per row
+        column_index = {str(name).strip(): i for i, name in enumerate(header) if name is not None}
+        missing_columns = REQUIRED_COLUMNS - column_index.keys()
+        if missing_columns:
+            raise ValueError(f"TicketMapping sheet is missing columns: {', '.join(sorted(missing_columns))}")
+        
+        category_col = column_index['Category']
+        keywords_col = column_index['Keywords']
+        required_fields_col = column_index['Required_Fields']
+        # Optional columns resolve to None when absent
+        active_col = column_index.get('Active')
+        work_type_options_col = column_index.get('Work_Type_Options')
+        populated_cols = [(column_index[excel_col], json_field) for excel_col, json_field in FIELD_MAPPINGS if excel_col in column_index]
+        
+        def cell(row, i) -> str:
+            """Stripped text of a cell ('' for an empty cell or absent column)"""
+            value = row[i] if i is not None and i < len(row) else None
+            return '' if value is None else str(value).strip()
+        
         # Convert to the expected JSON-like structure
         ticket_categories = {}
         default_category = "MNHT"  # Default fallback
         
-        for _, row in df.iterrows():
-            category = str(row.get('Category', '')).strip()
-            active = str(row.get('Active', 'Yes')).strip().lower()
+        for row in rows:
+            category = cell(row, category_col)
+            active = cell(row, active_col).lower()
             
             # Skip inactive categories
-            if active == 'no' or active == 'false' or not category:
+            if active in INACTIVE_VALUES or not category:
                 continue
             
             # Parse keywords
-            keywords_str = str(row.get('Keywords', ''))
-            keywords = [k.strip() for k in keywords_str.split(';') if k.strip()] if keywords_str != 'nan' else []
+            keywords_str = cell(row, keywords_col)
+            keywords = [k.strip() for k in keywords_str.split(';') if k.strip()]
             
             # Parse required fields
-            required_fields_str = str(row.get('Required_Fields', ''))
+            required_fields_str = cell(row, required_fields_col)
             required_fields = {}
-            if required_fields_str and required_fields_str != 'nan':
+            if required_fields_str:
                 for field in required_fields_str.split(';'):
                     field = field.strip()
                     if field:
@@ -85,22 +145,9 @@ class TicketMappingManager:
             
             # Build populated fields
             populated_fields = {}
-            field_mappings = {
-                'Project': 'project',
-                'Work_Type': 'work_type', 
-                'Priority': 'priority',
-                'Request_Type': 'request_type',
-                'Urgency': 'urgency',
-                'Impact': 'impact',
-                'Cloud_Operations_Request_Type': 'cloud_operations_request_type',
-                'Cloud_Environmental_List': 'cloud_environmental_list',
-                'Support_Org': 'support_org',
-                'JSD_Suppress_Group_Email_Notification': 'jsd_suppress_group_email_notification'
-            }
-            
-            for excel_col, json_field in field_mappings.items():
-                value = str(row.get(excel_col, '')).strip()
-                if value and value != 'nan':
+            for col, json_field in populated_cols:
+                value = cell(row, col)
+                if value:
                     populated_fields[json_field] = value
             
             # Add dynamic fields
@@ -113,10 +160,10 @@ class TicketMappingManager:
             
             # Parse work type options if available
             work_type_options = {}
-            work_type_options_str = str(row.get('Work_Type_Options', ''))
-            if work_type_options_str and work_type_options_str != 'nan':
+            work_type_options_str = cell(row, work_type_options_col)
+            if work_type_options_str:
                 try:
-                    work_type_options = json.loads(work_type_options_str)
+                    work_type_options = json_loads(work_type_options_str)
                 except:
                     # If JSON parsing fails, ignore work type options
                     pass
@@ -142,13 +189,50 @@ class TicketMappingManager:
         if not ticket_categories:
             raise ValueError("No active ticket categories found in Excel sheet")
     
+    def _excel_signature(self) -> List[int]:
+        """Cache version plus modification time and size of the Excel file, used to validate the cache"""
+        stat = os.stat(self.excel_file_path)
+        return [_CACHE_VERSION, stat.st_mtime_ns, stat.st_size]
+    
+    def _load_from_cache(self) -> bool:
+        """Load the cached Excel parse if the workbook has not changed since it was written"""
+        try:
+            signature = self._excel_signature()
+            with open(self.cache_file_path, 'rb') as f:
+                cached = json_loads(f.read())
+        except (OSError, ValueError):
+            return False
+        
+        if cached.get('signature') != signature or not cached.get('ticket_mapping'):
+            return False
+        self.ticket_mapping = cached['ticket_mapping']
+        return True
+    
+    def _save_cache(self):
+        """Write the Excel parse next to the JSON config (tmp file + rename, so readers never see a partial file)"""
+        try:
+            # Unique temp name, so workers starting together never share (and truncate) one temp file
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.cache_file_path)), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({'signature': self._excel_signature(), 'ticket_mapping': self.ticket_mapping}, f)
+                os.replace(tmp_path, self.cache_file_path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError as e:
+            print(f"⚠️ Could not write ticket mapping cache ({e})")
+    
     def _load_from_json(self):
         """Load ticket mapping configuration from JSON file (fallback)"""
         if not os.path.exists(self.json_file_path):
             raise FileNotFoundError(f"JSON file not found: {self.json_file_path}")
         
-        with open(self.json_file_path, 'r') as f:
-            self.ticket_mapping = json.load(f)
+        with open(self.json_file_path, 'rb') as f:
+            self.ticket_mapping = json_loads(f.read())
     
     def get_mapping(self) -> Dict[str, Any]:
         """Get the complete ticket mapping configuration"""
@@ -178,16 +262,18 @@ class TicketMappingManager:
         """Get list of active category names"""
         return list(self.get_categories().keys())
 
-# Global instance for easy import
-ticket_mapping_manager = TicketMappingManager()
+@lru_cache(maxsize=1)
+def get_ticket_mapping_manager() -> TicketMappingManager:
+    """Global instance, created (and the mapping loaded) on first use rather than at import"""
+    return TicketMappingManager()
 
 def get_ticket_mapping() -> Dict[str, Any]:
     """Convenience function to get ticket mapping"""
-    return ticket_mapping_manager.get_mapping()
+    return get_ticket_mapping_manager().get_mapping()
 
 def reload_ticket_mapping():
     """Convenience function to reload ticket mapping"""
-    ticket_mapping_manager.reload()
+    get_ticket_mapping_manager().reload()
 
 if __name__ == "__main__":
     # Test the mapping manager
@@ -10,6 +10,7 @@ from typing import List, Dict, Any, Optional
 import mimetypes
 import io
 import re
+import traceback
 from datetime import datetime
 
 # Content extraction libraries
@@ -490,7 +491,6 @@ class AzureBlobSharePointTool:
             print(f"❌ Error parsing blob list XML: {e}")
         except Exception as e:
             print(f"❌ Unexpected error in blob parsing: {e}")
-            import traceback
             traceback.print_exc()
         
         return blobs